@@ -4,7 +4,8 @@ Configuration settings for the TTS backend application.
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from pathlib import Path
-from functools import lru_cache
+from typing import Optional
+from functools import lru_cache, cached_property
 
 
 class Settings(BaseSettings):
@@ -21,6 +22,21 @@ class Settings(BaseSettings):
     default_temperature: float = Field(default=0.6, env="DEFAULT_TEMPERATURE")
     default_model: str = Field(default="bulbul:v3", env="DEFAULT_MODEL")
     
+    # TTS Request Throughput (0 disables the corresponding quota)
+    tts_concurrency: int = Field(default=4, env="TTS_CONCURRENCY")
+    tts_rpm: int = Field(default=300, env="TTS_RPM")
+    tts_tpm: int = Field(default=0, env="TTS_TPM")  # characters per minute
+    # Retries of a chunk rejected with 429, with exponential backoff from the base delay
+    tts_max_retries: int = Field(default=3, env="TTS_MAX_RETRIES")
+    tts_retry_base_seconds: float = Field(default=1.0, env="TTS_RETRY_BASE_SECONDS")
+    
+    # Synthesized chunk audio cache (memory budget in MB, 0 disables; persisted under speech output)
+    audio_cache_max_mb: int = Field(default=256, env="AUDIO_CACHE_MAX_MB")
+    audio_cache_persist: bool = Field(default=True, env="AUDIO_CACHE_PERSIST")
+    # Disk budget of the persisted cache in MB (0 leaves it unbounded); the least
+    # recently used files are deleted past it
+    audio_cache_disk_max_mb: int = Field(default=2048, env="AUDIO_CACHE_DISK_MAX_MB")
+    
     # Chunking Configuration
     max_chunk_size: int = Field(default=2000, env="MAX_CHUNK_SIZE")
     max_sentence_length: int = Field(default=500, env="MAX_SENTENCE_LENGTH")
@@ -29,8 +45,23 @@ class Settings(BaseSettings):
     translate_path: str = Field(default="../../pipeline/translate", env="TRANSLATE_PATH")
     speech_output_path: str = Field(default="../../pipeline/speech", env="SPEECH_OUTPUT_PATH")
     
+    # Seconds to reuse translate-folder scan results
+    file_listing_cache_ttl_seconds: float = Field(default=5.0, env="FILE_LISTING_CACHE_TTL_SECONDS")
+    
+    # Job storage (bounded LRU with TTL)
+    job_cache_max_size: int = Field(default=256, env="JOB_CACHE_MAX_SIZE")
+    job_cache_ttl_seconds: int = Field(default=3600, env="JOB_CACHE_TTL_SECONDS")
+    # Seconds between snapshots of the job store to disk (0 disables)
+    job_snapshot_interval_seconds: float = Field(default=60.0, env="JOB_SNAPSHOT_INTERVAL_SECONDS")
+    
+    # SSE backpressure (events buffered per client, seconds to wait on a full buffer)
+    sse_max_queue_size: int = Field(default=64, env="SSE_MAX_QUEUE_SIZE")
+    sse_queue_timeout: float = Field(default=5.0, env="SSE_QUEUE_TIMEOUT")
+    
     # CORS
     cors_origins: str = Field(default="http://localhost:5173,http://localhost:3000", env="CORS_ORIGINS")
+    # Optional regex (e.g. r"https://.*\.example\.com") used instead of the exact list
+    cors_origin_regex: Optional[str] = Field(default=None, env="CORS_ORIGIN_REGEX")
     
     # TTS Enhancement Settings
     heading_h1_loudness_boost: float = 1.3
@@ -48,23 +79,28 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
         extra = "ignore"
     
-    @property
+    @cached_property
     def translate_dir(self) -> Path:
-        """Get absolute path to translate directory."""
+        """Get absolute path to translate directory (resolved once)."""
         base = Path(__file__).parent
         return (base / self.translate_path).resolve()
     
-    @property
+    @cached_property
     def speech_output_dir(self) -> Path:
-        """Get absolute path to speech output directory."""
+        """Get absolute path to speech output directory (resolved once)."""
         base = Path(__file__).parent
         return (base / self.speech_output_path).resolve()
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
-        """Get CORS origins as a list."""
+        """Get CORS origins as a list (parsed once)."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @cached_property
+    def cors_origins_set(self) -> frozenset[str]:
+        """Get CORS origins as a frozenset for O(1) membership checks."""
+        return frozenset(self.cors_origins_list)
+
 
 @lru_cache
 def get_settings() -> Settings:
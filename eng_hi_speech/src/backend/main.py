@@ -11,25 +11,40 @@ Provides REST API for:
 - Real-time progress streaming via SSE
 """
 import base64
+import hashlib
+import io
 import logging
 import sys
 import asyncio
-import json
+import math
+import re
+import time
 from pathlib import Path
 from typing import Optional
 from contextlib import asynccontextmanager
-from datetime import datetime
+from typing import Any
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, UploadFile, File, Form, Request
+import orjson
+
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, UploadFile, File, Form, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sse_starlette.sse import EventSourceResponse
 
 
 # Configure logging
 def setup_logging():
     """Setup comprehensive logging for the application."""
+    # The format below never uses thread/process info or caller location, so skip
+    # collecting them on every record (see "Optimization" in the logging HOWTO)
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
     # Create formatter
     formatter = logging.Formatter(
         '%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s',
@@ -56,7 +71,7 @@ def setup_logging():
 # Initialize logging
 logger = setup_logging()
 
-from config import get_settings
+from config import Settings, get_settings
 from models import (
     FileInfo,
     LanguageFiles,
@@ -73,9 +88,13 @@ from models import (
     GenerationSummary,
 )
 from services import (
+    MarkdownParser,
+    FileDiscoveryService,
+    TTSService,
     create_parser,
     create_file_discovery_service,
     get_tts_service,
+    JobStore,
 )
 
 
@@ -83,29 +102,67 @@ from services import (
 VERSION = "1.0.0"
 
 
-# Store for active generation jobs
-_active_jobs: dict[str, dict] = {}
-# Rate limiting tracker
-_request_tracker: dict[str, list[float]] = {}
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson's C encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Store for active generation jobs, bounded in size and age so a long-running
+# server does not keep every parsed document it has ever generated. It is
+# snapshotted to disk periodically and reloaded on startup.
+_active_jobs = JobStore(
+    maxsize=get_settings().job_cache_max_size,
+    ttl=get_settings().job_cache_ttl_seconds,
+)
+
+
+async def snapshot_jobs_periodically(path: Path, interval: float):
+    """Write the job store to `path` every `interval` seconds while it changes."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await _active_jobs.snapshot(path)
+        except Exception as e:
+            logger.error("Job snapshot failed: %s", e)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
-    settings = get_settings()
-    logger.info(f"Starting TTS Backend v{VERSION}")
-    logger.info(f"Translate path: {settings.translate_dir}")
-    logger.info(f"Speech output path: {settings.speech_output_dir}")
-    logger.info(f"Sarvam AI configured: {bool(settings.sarvam_api_key)}")
+    settings = app.state.settings
+    logger.info("Starting TTS Backend v%s", VERSION)
+    logger.info("Translate path: %s", settings.translate_dir)
+    logger.info("Speech output path: %s", settings.speech_output_dir)
+    logger.info("Sarvam AI configured: %s", bool(settings.sarvam_api_key))
 
     # Ensure speech output directory exists
     settings.speech_output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Reload jobs from the last run so their status and exports stay available
+    snapshot_path = settings.speech_output_dir / "jobs.json"
+    snapshot_task = None
+    if settings.job_snapshot_interval_seconds > 0:
+        restored = _active_jobs.restore(snapshot_path)
+        for job in _active_jobs.values():
+            app.state.tts_service.restore_job(job["response"], job["chunk_keys"], job["api_stats"])
+        if restored:
+            logger.info("Restored %s jobs from %s", restored, snapshot_path)
+
+        snapshot_task = asyncio.create_task(
+            snapshot_jobs_periodically(snapshot_path, settings.job_snapshot_interval_seconds)
+        )
+
     yield
 
     # Shutdown
     logger.info("Shutting down TTS Backend")
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+        await _active_jobs.snapshot(snapshot_path)
+    await app.state.tts_service.aclose()
 
 
 # Create FastAPI app
@@ -114,29 +171,71 @@ app = FastAPI(
     description="Text-to-Speech API using Sarvam AI",
     version=VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
+# CORSMiddleware checks `origin in allow_origins` on every request, so a
+# frozenset keeps that lookup O(1) regardless of how many origins are configured.
+# When a regex is configured it is compiled once by the middleware and replaces
+# the exact-match list.
 settings = get_settings()
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins_list,
+    allow_origins=frozenset() if settings.cors_origin_regex else settings.cors_origins_set,
+    allow_origin_regex=settings.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (parsed documents, summaries, file listings).
+# Registered after CORS so it wraps it. Audio previews (and their Range
+# responses) and SSE streams are listed explicitly so they are always sent as
+# is; exclude_content_types needs Starlette >= 1.5.0, the pyproject floor.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5,
+    exclude_content_types=("audio/*", "text/event-stream"),
+)
+
+# Shared service instances, created once and injected into routes via Depends.
+# They are bound here rather than in `lifespan` so they are also available when
+# the app is driven without a lifespan (e.g. a bare TestClient).
+app.state.settings = settings
+app.state.parser = create_parser()
+app.state.file_service = create_file_discovery_service()
+app.state.tts_service = get_tts_service()
+
+
+def get_app_settings(request: Request) -> Settings:
+    """Dependency returning the application settings."""
+    return request.app.state.settings
+
+
+def get_parser(request: Request) -> MarkdownParser:
+    """Dependency returning the shared markdown parser."""
+    return request.app.state.parser
+
+
+def get_file_service(request: Request) -> FileDiscoveryService:
+    """Dependency returning the shared file discovery service."""
+    return request.app.state.file_service
+
+
+def get_tts(request: Request) -> TTSService:
+    """Dependency returning the shared TTS service."""
+    return request.app.state.tts_service
+
 
 # ============================================================================
 # Health & Status Endpoints
 # ============================================================================
 
 @app.get("/api/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(tts_service: TTSService = Depends(get_tts)):
     """Health check endpoint."""
-    settings = get_settings()
-    tts_service = get_tts_service()
-
     return HealthResponse(
         status="healthy",
         version=VERSION,
@@ -148,26 +247,64 @@ async def health_check():
 # File Discovery Endpoints
 # ============================================================================
 
-@app.get("/api/files", response_model=list[LanguageFiles])
-async def list_all_files():
+# Hot read endpoints return objects the services already built as validated
+# models, so they are dumped straight to JSON bytes instead of going through
+# response_model re-validation; `responses=` keeps the OpenAPI schema.
+_LANGUAGE_FILES_LIST = TypeAdapter(list[LanguageFiles])
+_FILE_INFO_LIST = TypeAdapter(list[FileInfo])
+
+
+def _json_bytes_response(content: bytes, headers: Optional[dict[str, str]] = None) -> Response:
+    """Wrap pre-serialized JSON bytes in a response."""
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client's If-None-Match matches the ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+@app.get("/api/files", response_model=None, responses={200: {"model": list[LanguageFiles]}})
+async def list_all_files(
+    request: Request,
+    file_service: FileDiscoveryService = Depends(get_file_service)
+):
     """
     List all available markdown files grouped by language.
 
     Returns files from the translate directory organized by language folder.
     """
-    file_service = create_file_discovery_service()
-    return file_service.discover_all_languages()
+    etag = file_service.get_listing_etag()
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    return _json_bytes_response(
+        _LANGUAGE_FILES_LIST.dump_json(file_service.discover_all_languages()),
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
 
 
-@app.get("/api/files/{language}", response_model=list[FileInfo])
-async def list_files_for_language(language: str):
+@app.get("/api/files/{language}", response_model=None, responses={200: {"model": list[FileInfo]}})
+async def list_files_for_language(
+    language: str,
+    request: Request,
+    file_service: FileDiscoveryService = Depends(get_file_service)
+):
     """
     List markdown files for a specific language.
 
     Args:
         language: Language folder name (e.g., "hi", "eng", "guj")
     """
-    file_service = create_file_discovery_service()
+    etag = file_service.get_listing_etag(language)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
     files = file_service.discover_files_for_language(language)
 
     if not files:
@@ -176,11 +313,20 @@ async def list_files_for_language(language: str):
             detail=f"No files found for language: {language}"
         )
 
-    return files
+    return _json_bytes_response(
+        _FILE_INFO_LIST.dump_json(files),
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
 
 
 @app.get("/api/files/{language}/{filename}/content")
-async def get_file_content(language: str, filename: str):
+async def get_file_content(
+    language: str,
+    filename: str,
+    request: Request,
+    file_service: FileDiscoveryService = Depends(get_file_service),
+    settings: Settings = Depends(get_app_settings)
+):
     """
     Get the raw content of a markdown file.
 
@@ -188,14 +334,19 @@ async def get_file_content(language: str, filename: str):
         language: Language folder name
         filename: Markdown filename
     """
-    file_service = create_file_discovery_service()
-    settings = get_settings()
-
     file_path = settings.translate_dir / language / filename
 
     try:
+        etag = file_service.get_file_etag(str(file_path))
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+
         content = file_service.get_file_content(str(file_path))
-        return {"content": content, "filename": filename, "language": language}
+        return ORJSONResponse(
+            {"content": content, "filename": filename, "language": language},
+            headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
     except ValueError as e:
@@ -213,24 +364,53 @@ class ParseRequest(BaseModel):
     max_chunk_size: Optional[int] = None
 
 
-@app.post("/api/parse", response_model=ParsedDocument)
-async def parse_markdown(request: ParseRequest):
+async def parse_request_body(request: Request) -> ParseRequest:
+    """
+    Validate the /api/parse body straight from the raw JSON bytes.
+
+    pydantic-core parses and validates in one pass, skipping the
+    intermediate dict FastAPI would otherwise build with json.loads.
+    """
+    try:
+        return ParseRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+
+
+@app.post(
+    "/api/parse",
+    response_model=ParsedDocument,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": ParseRequest.model_json_schema()}},
+        }
+    },
+)
+async def parse_markdown(
+    request: ParseRequest = Depends(parse_request_body),
+    settings: Settings = Depends(get_app_settings),
+    parser: MarkdownParser = Depends(get_parser)
+):
     """
     Parse a markdown file into TTS-optimized chunks.
 
     Returns structured document with chunks, pauses, and loudness settings.
     """
-    settings = get_settings()
-    file_path = settings.translate_dir / request.language / request.filename
+    file_path = resolve_translate_path(f"{request.language}/{request.filename}", settings)
 
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="File not found")
-
-    parser = create_parser(request.max_chunk_size)
+    # Only build a dedicated parser when the chunk size is overridden
+    if request.max_chunk_size is not None:
+        parser = create_parser(request.max_chunk_size)
 
     try:
         document = parser.parse_file(file_path, request.language)
         return document
+    except (FileNotFoundError, IsADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Parse error: {str(e)}")
 
@@ -239,257 +419,432 @@ async def parse_markdown(request: ParseRequest):
 # TTS Generation Endpoints
 # ============================================================================
 
-# Store for active generation jobs
-_active_jobs: dict[str, dict] = {}
-_rate_limit_requests: dict[str, list[float]] = {}
-_rate_limit_max = 5  # Max concurrent requests per client
-_rate_limit_window = 60  # Window in seconds
+# Per-client token buckets: client_ip -> (tokens, last_refill)
+_rate_limit_buckets: dict[str, tuple[float, float]] = {}
+_rate_limit_max = 5  # Burst size per client
+_rate_limit_window = 60  # Seconds to refill a full burst
+_rate_limit_rate = _rate_limit_max / _rate_limit_window  # Tokens per second
+_rate_limit_last_sweep = time.monotonic()
 
 
-def check_rate_limit(client_ip: str) -> bool:
-    """Check if client has exceeded rate limit."""
-    import time
-    now = time.time()
+def _refilled_tokens(client_ip: str, now: float) -> float:
+    """Current token balance for a client, including refill since last use."""
+    tokens, last = _rate_limit_buckets.get(client_ip, (_rate_limit_max, now))
+    return min(_rate_limit_max, tokens + (now - last) * _rate_limit_rate)
 
-    if client_ip not in _rate_limit_requests:
-        _rate_limit_requests[client_ip] = []
 
-    # Clean old requests
-    _rate_limit_requests[client_ip] = [
-        t for t in _rate_limit_requests[client_ip]
-        if now - t < _rate_limit_window
+def _sweep_rate_limits(now: float) -> None:
+    """Forget clients whose buckets have fully refilled."""
+    global _rate_limit_last_sweep
+    _rate_limit_last_sweep = now
+    idle = [
+        ip for ip, (_, last) in _rate_limit_buckets.items()
+        if now - last >= _rate_limit_window
     ]
+    for ip in idle:
+        del _rate_limit_buckets[ip]
+
 
-    if len(_rate_limit_requests[client_ip]) >= _rate_limit_max:
+def check_rate_limit(client_ip: str) -> bool:
+    """Check if client has exceeded rate limit."""
+    now = time.monotonic()
+
+    # Periodically drop idle clients so the tracker does not grow without bound
+    if now - _rate_limit_last_sweep >= _rate_limit_window:
+        _sweep_rate_limits(now)
+
+    tokens = _refilled_tokens(client_ip, now)
+    if tokens < 1:
+        _rate_limit_buckets[client_ip] = (tokens, now)
         return False
 
-    _rate_limit_requests[client_ip].append(now)
+    _rate_limit_buckets[client_ip] = (tokens - 1, now)
     return True
 
 
-@app.post("/api/tts/generate")
-async def generate_tts(request: GenerateTTSRequest, req: Request, background_tasks: BackgroundTasks):
-    """
-    Start TTS generation for a document.
+def rate_limit_retry_after(client_ip: str) -> int:
+    """Seconds until the client's bucket holds a full token again."""
+    tokens = _refilled_tokens(client_ip, time.monotonic())
+    return max(1, math.ceil((1 - tokens) / _rate_limit_rate))
 
-    Returns immediately with a job ID. Poll /api/tts/status/{job_id} for progress.
-    """
-    client_ip = req.client.host if req.client else "unknown"
-    logger.info(f"TTS generation request from {client_ip}: {request.file_path}")
 
-    # Check rate limit
+def enforce_rate_limit(client_ip: str) -> None:
+    """Raise 429 with a Retry-After header if the client is over its limit."""
     if not check_rate_limit(client_ip):
-        logger.warning(f"Rate limit exceeded for {client_ip}")
+        logger.warning("Rate limit exceeded for %s", client_ip)
         raise HTTPException(
             status_code=429,
-            detail="Too many requests. Please wait before trying again."
+            detail="Too many requests. Please wait before trying again.",
+            headers={"Retry-After": str(rate_limit_retry_after(client_ip))}
         )
 
-    settings = get_settings()
-    start_time = datetime.now()
 
-    # Parse the file path
-    file_path = Path(request.file_path)
-    if not file_path.is_absolute():
-        # Assume it's relative to translate directory
-        parts = request.file_path.split("/")
-        if len(parts) >= 2:
-            file_path = settings.translate_dir / parts[0] / parts[1]
-        else:
-            logger.error(f"Invalid file path: {request.file_path}")
+# Relative document paths are exactly "language/filename.md"
+_DOCUMENT_PATH_RE = re.compile(r'^([^/]+)/([^/]+)$')
+
+
+def resolve_translate_path(file_path: str, settings: Settings) -> Path:
+    """
+    Resolve a requested document path inside the translate directory.
+
+    Accepts "language/filename.md" (relative to the translate directory)
+    or an absolute path that lies within it.
+
+    Raises:
+        HTTPException: 400 for malformed paths, 403 for paths escaping the translate directory
+    """
+    path = Path(file_path)
+    if not path.is_absolute():
+        match = _DOCUMENT_PATH_RE.match(file_path)
+        if not match:
+            logger.error("Invalid file path: %s", file_path)
             raise HTTPException(status_code=400, detail="Invalid file path")
+        path = settings.translate_dir / match.group(1) / match.group(2)
 
-    if not file_path.exists():
-        logger.error(f"File not found: {file_path}")
-        raise HTTPException(status_code=404, detail="File not found")
+    resolved = path.resolve()
+    if not resolved.is_relative_to(settings.translate_dir):
+        logger.warning("Rejected file path outside translate directory: %s", file_path)
+        raise HTTPException(status_code=403, detail="Access denied: File must be within translate directory")
+
+    return resolved
 
-    # Extract language from path
+
+def rate_limited_client(req: Request) -> str:
+    """
+    Dependency admitting the calling client under the generation rate limit.
+
+    Declare it before other dependencies so rejected clients cause no file I/O.
+
+    Returns:
+        The client's IP address
+    """
+    client_ip = req.client.host if req.client else "unknown"
+    enforce_rate_limit(client_ip)
+    return client_ip
+
+
+def load_document(
+    request: GenerateTTSRequest,
+    settings: Settings = Depends(get_app_settings),
+    parser: MarkdownParser = Depends(get_parser)
+) -> ParsedDocument:
+    """
+    Dependency parsing the document requested for generation.
+
+    The language is taken from the document's folder. Opening the file is
+    the existence check, so there is no separate stat to race against.
+
+    Returns:
+        The parsed document
+    """
+    file_path = resolve_translate_path(request.file_path, settings)
     language = file_path.parent.name
-    logger.info(f"Processing file: {file_path.name}, language: {language}")
+    logger.info("Processing file: %s, language: %s", file_path.name, language)
+
+    try:
+        document = parser.parse_file(file_path, language)
+    except (FileNotFoundError, IsADirectoryError):
+        logger.error("File not found: %s", file_path)
+        raise HTTPException(status_code=404, detail="File not found")
+
+    logger.info("Parsed document: %s chunks, %s chars", len(document.chunks), document.total_characters)
+    return document
+
+
+def _job_record(document: ParsedDocument, response: GenerateTTSResponse, tts_service: TTSService) -> dict:
+    """Build the job store record of a generation, for export and snapshots."""
+    return {"document": document, "response": response, **tts_service.get_persistent_state(response.job_id)}
+
+
+@app.post("/api/tts/generate", response_model=None, responses={200: {"model": GenerateTTSResponse}})
+async def generate_tts(
+    request: GenerateTTSRequest,
+    background_tasks: BackgroundTasks,
+    include_audio: bool = Query(False, description="Include base64 chunk audio in the results"),
+    client_ip: str = Depends(rate_limited_client),
+    document: ParsedDocument = Depends(load_document),
+    tts_service: TTSService = Depends(get_tts)
+):
+    """
+    Start TTS generation for a document.
 
-    # Parse document
-    parser = create_parser()
-    document = parser.parse_file(file_path, language)
-    logger.info(f"Parsed document: {len(document.chunks)} chunks, {document.total_characters} chars")
+    Returns immediately with a job ID. Poll /api/tts/status/{job_id} for progress.
+    """
+    logger.info("TTS generation request from %s: %s", client_ip, request.file_path)
 
-    # Start generation
-    tts_service = get_tts_service()
+    start_time = time.perf_counter()
 
     # Generate synchronously for now (can be made async with background tasks)
-    results = []
+    # Only the last progress update is needed, so don't retain the others
+    final_response = None
     chunk_count = 0
     async for response in tts_service.generate_tts_for_document(
         document,
         request.settings,
         request.chunks_to_generate
     ):
-        results.append(response)
+        final_response = response
         if response.completed_chunks > chunk_count:
             chunk_count = response.completed_chunks
-            logger.info(f"Progress: {chunk_count}/{response.total_chunks} chunks completed")
-
-    final_response = results[-1] if results else None
+            logger.info("Progress: %s/%s chunks completed", chunk_count, response.total_chunks)
 
     if final_response:
         # Store document for export
-        _active_jobs[final_response.job_id] = {
-            "document": document,
-            "response": final_response
-        }
+        _active_jobs[final_response.job_id] = _job_record(document, final_response, tts_service)
 
-        duration = (datetime.now() - start_time).total_seconds()
-        logger.info(f"TTS generation completed in {duration:.2f}s - Job ID: {final_response.job_id}")
-        return final_response
+        duration = time.perf_counter() - start_time
+        logger.info("TTS generation completed in %.2fs - Job ID: %s", duration, final_response.job_id)
+        return _job_response(final_response, include_audio)
 
     logger.error("TTS generation failed - no response")
     raise HTTPException(status_code=500, detail="Failed to generate TTS")
 
 
+# Minimum seconds between progress events that report the same percentage
+_SSE_PROGRESS_INTERVAL = 0.25
+_SSE_HEADERS = {"X-Accel-Buffering": "no", "Cache-Control": "no-cache"}
+# Fixed payload sent to clients dropped for not reading fast enough
+_SSE_SLOW_CLIENT_DATA = orjson.dumps({"error": "slow_client"}).decode()
+
+
+class _SlowClient(Exception):
+    """The SSE client did not take an event within `sse_queue_timeout`."""
+
+
 @app.post("/api/tts/generate/stream")
-async def generate_tts_stream(request: GenerateTTSRequest, req: Request):
+async def generate_tts_stream(
+    request: GenerateTTSRequest,
+    client_ip: str = Depends(rate_limited_client),
+    document: ParsedDocument = Depends(load_document),
+    settings: Settings = Depends(get_app_settings),
+    tts_service: TTSService = Depends(get_tts)
+):
     """
     Start TTS generation with SSE streaming for real-time progress updates.
 
     Returns Server-Sent Events with progress updates.
     """
-    client_ip = req.client.host if req.client else "unknown"
-    logger.info(f"SSE TTS generation request from {client_ip}: {request.file_path}")
-
-    # Check rate limit
-    if not check_rate_limit(client_ip):
-        logger.warning(f"Rate limit exceeded for {client_ip}")
-        raise HTTPException(
-            status_code=429,
-            detail="Too many requests. Please wait before trying again."
-        )
-
-    settings = get_settings()
-
-    # Parse the file path
-    file_path = Path(request.file_path)
-    if not file_path.is_absolute():
-        parts = request.file_path.split("/")
-        if len(parts) >= 2:
-            file_path = settings.translate_dir / parts[0] / parts[1]
-        else:
-            raise HTTPException(status_code=400, detail="Invalid file path")
+    logger.info("SSE TTS generation request from %s: %s", client_ip, request.file_path)
 
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="File not found")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, settings.sse_max_queue_size))
 
-    language = file_path.parent.name
+    async def emit(event: Optional[dict]) -> None:
+        """Queue an event, waiting at most `sse_queue_timeout` for the client to catch up."""
+        try:
+            await asyncio.wait_for(queue.put(event), timeout=settings.sse_queue_timeout)
+        except asyncio.TimeoutError:
+            raise _SlowClient from None
 
-    async def event_generator():
-        """Generate SSE events for TTS progress."""
+    async def produce_events():
+        """Run generation and push SSE events into the bounded queue."""
         try:
-            parser = create_parser()
-            document = parser.parse_file(file_path, language)
-
-            # Send initial event
-            yield {
-                "event": "start",
-                "data": json.dumps({
-                    "total_chunks": len(document.chunks),
-                    "total_characters": document.total_characters,
-                    "filename": document.filename
+            try:
+                # Send initial event
+                await emit({
+                    "event": "start",
+                    "data": orjson.dumps({
+                        "total_chunks": len(document.chunks),
+                        "total_characters": document.total_characters,
+                        "filename": document.filename
+                    }).decode()
                 })
-            }
 
-            tts_service = get_tts_service()
-
-            async for response in tts_service.generate_tts_for_document(
-                document,
-                request.settings,
-                request.chunks_to_generate
-            ):
-                # Store for later export
-                _active_jobs[response.job_id] = {
-                    "document": document,
-                    "response": response
-                }
-
-                yield {
-                    "event": "progress",
-                    "data": json.dumps({
-                        "job_id": response.job_id,
-                        "completed_chunks": response.completed_chunks,
-                        "total_chunks": response.total_chunks,
-                        "status": response.status,
-                        "percentage": int((response.completed_chunks / response.total_chunks) * 100) if response.total_chunks > 0 else 0
+                last_percentage = -1
+                last_emit = 0.0
+                async for response in tts_service.generate_tts_for_document(
+                    document,
+                    request.settings,
+                    request.chunks_to_generate
+                ):
+                    # Store for later export
+                    _active_jobs[response.job_id] = _job_record(document, response, tts_service)
+
+                    # Coalesce: only report when the percentage moves or the client
+                    # has not heard from us for a while
+                    percentage = int((response.completed_chunks / response.total_chunks) * 100) if response.total_chunks > 0 else 0
+                    now = time.monotonic()
+                    if percentage == last_percentage and now - last_emit < _SSE_PROGRESS_INTERVAL:
+                        continue
+                    last_percentage = percentage
+                    last_emit = now
+
+                    await emit({
+                        "event": "progress",
+                        "data": orjson.dumps({
+                            "completed_chunks": response.completed_chunks,
+                            "total_chunks": response.total_chunks,
+                            "status": response.status,
+                            "percentage": percentage
+                        }).decode()
                     })
-                }
 
-                # Small delay to prevent flooding
-                await asyncio.sleep(0.1)
+                # Send completion event
+                await emit({
+                    "event": "complete",
+                    "data": orjson.dumps({
+                        "job_id": response.job_id,
+                        "status": response.status
+                    }).decode()
+                })
 
-            # Send completion event
-            yield {
-                "event": "complete",
-                "data": json.dumps({
-                    "job_id": response.job_id,
-                    "status": response.status
+            except _SlowClient:
+                raise
+            except Exception as e:
+                logger.error("SSE generation error: %s", e)
+                await emit({
+                    "event": "error",
+                    "data": orjson.dumps({"error": str(e)}).decode()
                 })
-            }
 
-        except Exception as e:
-            logger.error(f"SSE generation error: {e}")
-            yield {
-                "event": "error",
-                "data": json.dumps({"error": str(e)})
-            }
+            await emit(None)
 
-    return EventSourceResponse(event_generator())
+        except _SlowClient:
+            logger.warning("SSE client %s too slow, closing stream", client_ip)
+            # Replace the backlog so the client gets the error as soon as it reads again
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"event": "error", "data": _SSE_SLOW_CLIENT_DATA})
+            queue.put_nowait(None)
 
+    async def event_generator():
+        """Generate SSE events for TTS progress."""
+        producer = asyncio.create_task(produce_events())
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            producer.cancel()
 
-@app.get("/api/tts/status/{job_id}", response_model=GenerateTTSResponse)
-async def get_tts_status(job_id: str):
+    # Ask reverse proxies (nginx) to forward each event immediately
+    return EventSourceResponse(event_generator(), headers=_SSE_HEADERS)
+
+
+@app.get("/api/tts/status/{job_id}", response_model=None, responses={200: {"model": GenerateTTSResponse}})
+async def get_tts_status(
+    job_id: str,
+    include_audio: bool = Query(False, description="Include base64 chunk audio in the results"),
+    tts_service: TTSService = Depends(get_tts)
+):
     """Get the status of a TTS generation job."""
-    tts_service = get_tts_service()
     status = tts_service.get_job_status(job_id)
 
     if not status:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    return status
+    return _job_response(status, include_audio)
+
+
+def _job_response(response: GenerateTTSResponse, include_audio: bool) -> Response:
+    """
+    Serialize a job's status; chunk audio is base64-encoded only on request.
+
+    The service keeps decoded audio, so clients that only export or preview
+    never pay for encoding (or downloading) every chunk.
+    """
+    if include_audio:
+        response = response.model_copy(update={"results": [
+            result.model_copy(update={"audio_base64": base64.b64encode(result.audio_bytes).decode('ascii')})
+            if result.audio_bytes else result
+            for result in response.results
+        ]})
+    return _json_bytes_response(response.model_dump_json().encode())
+
+
+# A single `bytes=start-end`, `bytes=start-` or `bytes=-suffix` range
+_BYTE_RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+def _bytes_response(request: Request, content: bytes, media_type: str, headers: dict[str, str]) -> Response:
+    """
+    Serve in-memory bytes, honouring a single-range Range header.
+
+    Media players seek with Range requests, like they do against files
+    served by FileResponse. Multi-range and malformed headers get the full body.
+    """
+    headers = {**headers, "Accept-Ranges": "bytes"}
+    match = _BYTE_RANGE_RE.fullmatch(request.headers.get("range", "").strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return Response(content=content, media_type=media_type, headers=headers)
+
+    size = len(content)
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(0, size - int(last)), size - 1
+    if start > end or start >= size:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return Response(content=content[start:end + 1], status_code=206, media_type=media_type, headers=headers)
 
 
 @app.get("/api/tts/preview/{job_id}/{chunk_id}")
-async def preview_chunk_audio(job_id: str, chunk_id: int):
+async def preview_chunk_audio(
+    request: Request,
+    job_id: str,
+    chunk_id: int,
+    tts_service: TTSService = Depends(get_tts)
+):
     """
     Get audio preview for a specific chunk.
 
     Returns the audio as a WAV file.
     """
-    tts_service = get_tts_service()
+    headers = {
+        "Content-Disposition": f"inline; filename=chunk_{chunk_id}.wav",
+        "Cache-Control": "private, max-age=86400",
+    }
+
+    # Persisted chunks are served from the audio cache file: sendfile avoids
+    # copying through Python, and Range requests let players seek
+    path = tts_service.get_audio_preview_path(job_id, chunk_id)
+    if path is not None:
+        return FileResponse(path, media_type="audio/wav", headers=headers)
+
     audio = tts_service.get_audio_preview(job_id, chunk_id)
 
     if not audio:
         raise HTTPException(status_code=404, detail="Audio not found")
 
-    return StreamingResponse(
-        iter([audio]),
-        media_type="audio/wav",
-        headers={
-            "Content-Disposition": f"inline; filename=chunk_{chunk_id}.wav"
-        }
-    )
+    # The chunk is already fully in memory, so send it (or the requested
+    # range) as a single sized body rather than through a streaming iterator
+    return _bytes_response(request, audio, "audio/wav", headers)
+
+
+def _export_record(output_path: Path, file_size: int, duration: float) -> tuple[Path, int, float, int]:
+    """Describe an exported file as (path, size, duration, mtime_ns) for later reuse."""
+    return output_path, file_size, duration, output_path.stat().st_mtime_ns
+
+
+def _export_is_current(record: tuple) -> bool:
+    """
+    Check that an exported file is still the one this job wrote.
+
+    Exports can share a filename across jobs, so a file whose size or
+    mtime changed was overwritten and must be re-encoded.
+    """
+    output_path, file_size, _, mtime_ns = record
+    try:
+        stat = output_path.stat()
+    except OSError:
+        return False
+    return stat.st_size == file_size and stat.st_mtime_ns == mtime_ns
 
 
 @app.post("/api/tts/export", response_model=ExportResponse)
-async def export_audio(request: ExportRequest):
+async def export_audio(request: ExportRequest, tts_service: TTSService = Depends(get_tts)):
     """
     Export the generated audio as MP3 or WAV.
 
     Concatenates all chunks with appropriate pauses and loudness adjustments.
     """
-    if request.job_id not in _active_jobs:
+    job_data = _active_jobs.get(request.job_id)
+    if job_data is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job_data = _active_jobs[request.job_id]
     document = job_data["document"]
 
-    tts_service = get_tts_service()
-
     try:
         output_path, file_size, duration = await tts_service.export_audio(
             request.job_id,
@@ -497,6 +852,9 @@ async def export_audio(request: ExportRequest):
             request.filename if hasattr(request, 'filename') else None,
             request.format
         )
+        # Remember the export so a later download can skip re-encoding
+        job_data.setdefault("exports", {})[request.format] = _export_record(output_path, file_size, duration)
+        _active_jobs.mark_dirty()
 
         return ExportResponse(
             success=True,
@@ -512,22 +870,32 @@ async def export_audio(request: ExportRequest):
 
 
 @app.get("/api/tts/download/{job_id}")
-async def download_audio(job_id: str, format: str = "mp3"):
+async def download_audio(
+    job_id: str,
+    format: str = "mp3",
+    tts_service: TTSService = Depends(get_tts)
+):
     """Download the exported audio file."""
-    if job_id not in _active_jobs:
+    job_data = _active_jobs.get(job_id)
+    if job_data is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job_data = _active_jobs[job_id]
     document = job_data["document"]
-
-    tts_service = get_tts_service()
+    exports = job_data.setdefault("exports", {})
 
     try:
-        output_path, _, _ = await tts_service.export_audio(
-            job_id,
-            document,
-            format=format
-        )
+        # Reuse an earlier export in this format if it is still on disk unchanged
+        cached = exports.get(format)
+        if cached and _export_is_current(cached):
+            output_path = cached[0]
+        else:
+            output_path, file_size, duration = await tts_service.export_audio(
+                job_id,
+                document,
+                format=format
+            )
+            exports[format] = _export_record(output_path, file_size, duration)
+            _active_jobs.mark_dirty()
 
         return FileResponse(
             output_path,
@@ -542,65 +910,110 @@ async def download_audio(job_id: str, format: str = "mp3"):
 # Settings Endpoints
 # ============================================================================
 
+# Settings are fixed for the lifetime of the process, so the defaults payload
+# is serialized once here instead of on every request
+_DEFAULT_SETTINGS_JSON = orjson.dumps({
+    "target_language_code": "hi-IN",
+    "speaker": settings.default_speaker,
+    "pace": settings.default_pace,
+    "speech_sample_rate": settings.default_sample_rate,
+    "model": settings.default_model,
+    "temperature": settings.default_temperature,
+    "enable_preprocessing": True,
+    "heading_loudness_boost": 1.2,
+    "pause_after_heading_ms": 500,
+    "pause_after_bullet_ms": 300,
+})
+
+
+def _static_headers(content: bytes, cache_control: str) -> dict[str, str]:
+    """Build ETag and Cache-Control headers for a payload serialized at import."""
+    etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def _static_json_response(request: Request, content: bytes, headers: dict[str, str]) -> Response:
+    """Serve a precomputed JSON payload, answering 304 to a matching If-None-Match."""
+    not_modified = _not_modified(request, headers["ETag"])
+    if not_modified:
+        return not_modified
+    return _json_bytes_response(content, headers)
+
+
+# Defaults follow the server's environment, so clients revalidate them
+_DEFAULT_SETTINGS_HEADERS = _static_headers(_DEFAULT_SETTINGS_JSON, "no-cache")
+
+
 @app.get("/api/settings/defaults")
-async def get_default_settings():
+async def get_default_settings(request: Request):
     """Get default TTS settings."""
-    settings = get_settings()
-
-    return {
-        "target_language_code": "hi-IN",
-        "speaker": settings.default_speaker,
-        "pace": settings.default_pace,
-        "speech_sample_rate": settings.default_sample_rate,
-        "model": settings.default_model,
-        "temperature": settings.default_temperature,
-        "enable_preprocessing": True,
-        "heading_loudness_boost": 1.2,
-        "pause_after_heading_ms": 500,
-        "pause_after_bullet_ms": 300,
-    }
+    return _static_json_response(request, _DEFAULT_SETTINGS_JSON, _DEFAULT_SETTINGS_HEADERS)
+
+
+# Speaker and language catalogues are constants, so they are serialized once
+# and served with a Cache-Control max-age, then revalidated by ETag
+_SPEAKERS_JSON = orjson.dumps({
+    "speakers": [
+        {"id": "shubh", "name": "Shubh", "gender": "male"},
+        {"id": "arvind", "name": "Arvind", "gender": "male"},
+        {"id": "meera", "name": "Meera", "gender": "female"},
+        {"id": "pavithra", "name": "Pavithra", "gender": "female"},
+        {"id": "maitreyi", "name": "Maitreyi", "gender": "female"},
+        {"id": "amol", "name": "Amol", "gender": "male"},
+        {"id": "amartya", "name": "Amartya", "gender": "male"},
+    ]
+})
+
+_LANGUAGES_JSON = orjson.dumps({
+    "languages": [
+        {"code": "hi-IN", "name": "Hindi"},
+        {"code": "en-IN", "name": "English (India)"},
+        {"code": "gu-IN", "name": "Gujarati"},
+        {"code": "bn-IN", "name": "Bengali"},
+        {"code": "kn-IN", "name": "Kannada"},
+        {"code": "ml-IN", "name": "Malayalam"},
+        {"code": "mr-IN", "name": "Marathi"},
+        {"code": "od-IN", "name": "Odia"},
+        {"code": "pa-IN", "name": "Punjabi"},
+        {"code": "ta-IN", "name": "Tamil"},
+        {"code": "te-IN", "name": "Telugu"},
+    ]
+})
+
+_SPEAKERS_HEADERS = _static_headers(_SPEAKERS_JSON, "public, max-age=3600")
+_LANGUAGES_HEADERS = _static_headers(_LANGUAGES_JSON, "public, max-age=3600")
 
 
 @app.get("/api/settings/speakers")
-async def get_available_speakers():
+async def get_available_speakers(request: Request):
     """Get list of available TTS speakers."""
-    return {
-        "speakers": [
-            {"id": "shubh", "name": "Shubh", "gender": "male"},
-            {"id": "arvind", "name": "Arvind", "gender": "male"},
-            {"id": "meera", "name": "Meera", "gender": "female"},
-            {"id": "pavithra", "name": "Pavithra", "gender": "female"},
-            {"id": "maitreyi", "name": "Maitreyi", "gender": "female"},
-            {"id": "amol", "name": "Amol", "gender": "male"},
-            {"id": "amartya", "name": "Amartya", "gender": "male"},
-        ]
-    }
+    return _static_json_response(request, _SPEAKERS_JSON, _SPEAKERS_HEADERS)
 
 
 @app.get("/api/settings/languages")
-async def get_available_languages():
+async def get_available_languages(request: Request):
     """Get list of available TTS languages."""
-    return {
-        "languages": [
-            {"code": "hi-IN", "name": "Hindi"},
-            {"code": "en-IN", "name": "English (India)"},
-            {"code": "gu-IN", "name": "Gujarati"},
-            {"code": "bn-IN", "name": "Bengali"},
-            {"code": "kn-IN", "name": "Kannada"},
-            {"code": "ml-IN", "name": "Malayalam"},
-            {"code": "mr-IN", "name": "Marathi"},
-            {"code": "od-IN", "name": "Odia"},
-            {"code": "pa-IN", "name": "Punjabi"},
-            {"code": "ta-IN", "name": "Tamil"},
-            {"code": "te-IN", "name": "Telugu"},
-        ]
-    }
+    return _static_json_response(request, _LANGUAGES_JSON, _LANGUAGES_HEADERS)
 
 
 # ============================================================================
 # File Upload and Markdown Write Endpoints
 # ============================================================================
 
+# First-level heading line ("# Title"), allowing leading indentation
+_H1_TITLE_RE = re.compile(r'^[ \t]*# (.*)$', re.MULTILINE)
+
+
+def _read_upload_text(upload) -> str:
+    """Decode a spooled upload as UTF-8 in a single incremental pass."""
+    reader = io.TextIOWrapper(upload, encoding='utf-8', newline='')
+    try:
+        return reader.read()
+    finally:
+        # Detach so closing the wrapper does not close the upload file itself
+        reader.detach()
+
+
 @app.post("/api/files/upload", response_model=UploadedFileInfo)
 async def upload_markdown(
     file: UploadFile = File(...),
@@ -615,34 +1028,39 @@ async def upload_markdown(
     if not file.filename.endswith('.md'):
         raise HTTPException(status_code=400, detail="Only markdown (.md) files are supported")
 
-    content = await file.read()
-    content_str = content.decode('utf-8')
+    # Decode the spooled upload once (the response carries the full content).
+    # Large uploads are spooled to disk, so read off the event loop.
+    try:
+        content_str = await asyncio.to_thread(_read_upload_text, file.file)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File is not valid UTF-8 text")
 
-    # Extract title from first H1 heading
-    title = None
-    for line in content_str.split('\n'):
-        line = line.strip()
-        if line.startswith('# '):
-            title = line[2:].strip()
-            break
+    # Extract title from first H1 heading; the regex stops at the first match
+    match = _H1_TITLE_RE.search(content_str)
+    title = match.group(1).strip() if match else None
+
+    size_bytes = file.size if file.size is not None else len(content_str.encode('utf-8'))
 
     return UploadedFileInfo(
         filename=file.filename,
         language=language,
         content=content_str,
-        size_bytes=len(content),
+        size_bytes=size_bytes,
         title=title
     )
 
 
 @app.post("/api/files/write", response_model=MarkdownWriteResponse)
-async def write_markdown(request: MarkdownWriteRequest):
+async def write_markdown(
+    request: MarkdownWriteRequest,
+    settings: Settings = Depends(get_app_settings),
+    file_service: FileDiscoveryService = Depends(get_file_service)
+):
     """
     Write markdown content to a file in the translate directory.
 
     This can be used to save uploaded content or create new files.
     """
-    settings = get_settings()
 
     # Ensure filename ends with .md
     filename = request.filename
@@ -666,6 +1084,7 @@ async def write_markdown(request: MarkdownWriteRequest):
 
         # Write the file
         target_path.write_text(request.content, encoding='utf-8')
+        file_service.invalidate_cache()
 
         return MarkdownWriteResponse(
             success=True,
@@ -683,14 +1102,14 @@ async def write_markdown(request: MarkdownWriteRequest):
 async def parse_markdown_content(
     content: str = Form(...),
     language: str = Form(default="hi"),
-    filename: str = Form(default="uploaded.md")
+    filename: str = Form(default="uploaded.md"),
+    parser: MarkdownParser = Depends(get_parser)
 ):
     """
     Parse markdown content directly (for uploaded files).
 
     This parses content without requiring a file on disk.
     """
-    parser = create_parser()
 
     try:
         document = parser.parse_content(content, filename, language)
@@ -703,8 +1122,8 @@ async def parse_markdown_content(
 # API Statistics Endpoints
 # ============================================================================
 
-@app.get("/api/tts/summary/{job_id}", response_model=GenerationSummary)
-async def get_generation_summary(job_id: str):
+@app.get("/api/tts/summary/{job_id}", response_model=None, responses={200: {"model": GenerationSummary}})
+async def get_generation_summary(job_id: str, tts_service: TTSService = Depends(get_tts)):
     """
     Get detailed statistics summary for a TTS generation job.
 
@@ -714,13 +1133,12 @@ async def get_generation_summary(job_id: str):
     - Response times
     - Per-chunk statistics
     """
-    tts_service = get_tts_service()
     summary = tts_service.get_generation_summary(job_id)
 
     if not summary:
         raise HTTPException(status_code=404, detail="Job not found or no statistics available")
 
-    return summary
+    return _json_bytes_response(summary.model_dump_json().encode())
 
 
 # ============================================================================
@@ -1,7 +1,7 @@
 """
 Pydantic models and schemas for the TTS API.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Literal
 from enum import Enum
 
@@ -45,6 +45,9 @@ class Speaker(str, Enum):
 
 class ContentChunk(BaseModel):
     """A parsed chunk of content."""
+    # Created per chunk and never modified afterwards; frozen makes them hashable
+    model_config = ConfigDict(use_enum_values=True, frozen=True, extra='forbid')
+
     id: int
     type: ChunkType
     text: str
@@ -53,9 +56,6 @@ class ContentChunk(BaseModel):
     pause_after_ms: int = 300
     loudness_boost: float = 1.0
 
-    class Config:
-        use_enum_values = True
-
 
 class ParsedDocument(BaseModel):
     """A fully parsed document."""
@@ -109,11 +109,16 @@ class GenerateTTSRequest(BaseModel):
 
 class TTSChunkResult(BaseModel):
     """Result of TTS generation for a single chunk."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     chunk_id: int
     success: bool
+    # Only filled in API responses that ask for audio (include_audio=true)
     audio_base64: Optional[str] = None
     duration_ms: Optional[int] = None
     error: Optional[str] = None
+    # Decoded audio as held by the TTS service; never serialized
+    audio_bytes: Optional[bytes] = Field(default=None, exclude=True, repr=False)
 
 
 class GenerateTTSResponse(BaseModel):
@@ -186,6 +191,8 @@ class UploadedFileInfo(BaseModel):
 
 class APICallStats(BaseModel):
     """Statistics for a single API call."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     chunk_id: int
     characters_sent: int
     bytes_sent: int
@@ -207,6 +214,7 @@ class GenerationSummary(BaseModel):
     total_bytes_received: int
     total_duration_ms: int
     average_response_time_ms: float
+    cached_chunks: int = 0  # Chunks served from the audio cache without an API call
     output_file_size_bytes: Optional[int] = None
     output_duration_seconds: Optional[float] = None
     calls: list[APICallStats] = []
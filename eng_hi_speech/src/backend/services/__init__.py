@@ -2,6 +2,9 @@
 from services.markdown_parser import MarkdownParser, create_parser
 from services.file_discovery import FileDiscoveryService, create_file_discovery_service
 from services.tts_service import TTSService, get_tts_service
+from services.rate_limiter import TokenBucket, RateLimiter
+from services.audio_cache import AudioCache
+from services.job_store import JobStore
 
 __all__ = [
     "MarkdownParser",
@@ -10,4 +13,8 @@ __all__ = [
     "create_file_discovery_service",
     "TTSService",
     "get_tts_service",
+    "TokenBucket",
+    "RateLimiter",
+    "AudioCache",
+    "JobStore",
 ]
@@ -0,0 +1,169 @@
+"""
+Audio Cache
+
+Content-addressed store of synthesized chunk audio, so identical requests
+to Sarvam AI (same text and voice settings) are only paid for once.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import orjson
+from cachetools import LRUCache
+
+logger = logging.getLogger('tts_backend.audio_cache')
+
+
+class AudioCache:
+    """
+    Two-level audio cache: a size-bounded in-memory LRU in front of an
+    optional on-disk directory sharded by the first two hex digits of the key.
+
+    The directory can be bounded too: when a write takes it over budget, the
+    files read or written longest ago (by mtime, which disk hits refresh) are
+    deleted.
+    """
+
+    def __init__(self, max_bytes: int, directory: Optional[Path] = None, max_disk_bytes: int = 0):
+        """
+        Args:
+            max_bytes: Memory budget for cached audio; 0 disables the memory level
+            directory: Where to persist audio (None keeps the cache in memory only)
+            max_disk_bytes: Budget for the directory; 0 leaves it unbounded
+        """
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        # Bytes in the directory, counted by a scan on the first write; writes
+        # run in worker threads, hence the lock
+        self._disk_bytes: Optional[int] = None
+        self._disk_lock = threading.Lock()
+        self._memory: Optional[LRUCache] = (
+            LRUCache(maxsize=max_bytes, getsizeof=len) if max_bytes > 0 else None
+        )
+
+    @staticmethod
+    def key_for(payload: dict) -> str:
+        """
+        Build the cache key for a TTS request payload.
+
+        The key covers every field sent to the API, so any setting that
+        changes the audio also changes the key.
+        """
+        return hashlib.blake2b(
+            orjson.dumps(payload, option=orjson.OPT_SORT_KEYS),
+            digest_size=20
+        ).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def file_for(self, key: str) -> Optional[Path]:
+        """Return the on-disk file holding `key`'s audio, if it has been persisted."""
+        if self.directory is None:
+            return None
+        path = self._path_for(key)
+        return path if path.is_file() else None
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        # Entries larger than the whole budget are simply not kept in memory
+        if self._memory is not None and len(audio) <= self._memory.maxsize:
+            self._memory[key] = audio
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio for `key`, or None on a miss."""
+        if self._memory is not None:
+            audio = self._memory.get(key)
+            if audio is not None:
+                return audio
+
+        if self.directory is None:
+            return None
+
+        try:
+            audio = await asyncio.to_thread(self._read, key)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Audio cache read failed for %s: %s", key, e)
+            return None
+
+        self._remember(key, audio)
+        return audio
+
+    async def put(self, key: str, audio: bytes) -> None:
+        """Store audio under `key` in memory and, if configured, on disk."""
+        self._remember(key, audio)
+
+        if self.directory is not None:
+            try:
+                await asyncio.to_thread(self._write, key, audio)
+            except OSError as e:
+                logger.warning("Audio cache write failed for %s: %s", key, e)
+
+    def _read(self, key: str) -> bytes:
+        path = self._path_for(key)
+        audio = path.read_bytes()
+        if self.max_disk_bytes > 0:
+            # Mark the file as recently used so pruning keeps it
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return audio
+
+    def _write(self, key: str, audio: bytes) -> None:
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = path.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(audio)
+        os.replace(tmp_path, path)
+
+        if self.max_disk_bytes > 0:
+            with self._disk_lock:
+                if self._disk_bytes is None:
+                    self._disk_bytes = sum(size for _, size, _ in self._scan())
+                else:
+                    self._disk_bytes += len(audio)
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._prune()
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        """List (mtime, size, path) of every cached file."""
+        with os.scandir(self.directory) as shards:
+            shard_paths = [shard.path for shard in shards if shard.is_dir()]
+
+        files = []
+        for shard_path in shard_paths:
+            with os.scandir(shard_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".tmp") or not entry.is_file():
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _prune(self) -> None:
+        """Delete the least recently used files until the directory fits its budget."""
+        files = sorted(self._scan())
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._disk_bytes = total
+        logger.info("Audio cache pruned %s files, %s bytes remain", removed, total)
@@ -6,7 +6,13 @@ and organizes them by language.
 """
 from pathlib import Path
 from typing import Optional
+import hashlib
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import LRUCache, TTLCache
 
 from models.schemas import FileInfo, LanguageFiles, LanguageCode
 from config import get_settings
@@ -27,6 +33,24 @@ LANGUAGE_MAP = {
     "te": ("Telugu", LanguageCode.TELUGU),
 }
 
+# Titles are taken from the first H1 found in the head of the file; the
+# regex runs over raw bytes so only the matched title is ever decoded
+_TITLE_SCAN_BYTES = 4096
+_H1_TITLE_RE = re.compile(rb'^[ \t]*# (.*)$', re.MULTILINE)
+
+# Title reads are I/O-bound; every service shares one pool, created on first use
+_title_executor: Optional[ThreadPoolExecutor] = None
+_title_executor_lock = threading.Lock()
+
+
+def _get_title_executor() -> ThreadPoolExecutor:
+    """Get the title-reading thread pool shared by all discovery services."""
+    global _title_executor
+    with _title_executor_lock:
+        if _title_executor is None:
+            _title_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="title-scan")
+        return _title_executor
+
 
 class FileDiscoveryService:
     """
@@ -46,6 +70,14 @@ class FileDiscoveryService:
     def __init__(self, translate_path: Optional[Path] = None):
         settings = get_settings()
         self.translate_path = translate_path or settings.translate_dir
+        # Short-lived cache of scan results so bursts of UI requests share one scan
+        self._cache: TTLCache = TTLCache(maxsize=64, ttl=settings.file_listing_cache_ttl_seconds)
+        # Titles keyed by (path, mtime_ns, size), so unchanged files are never reopened
+        self._title_cache: LRUCache = LRUCache(maxsize=4096)
+    
+    def invalidate_cache(self) -> None:
+        """Drop cached scan results (call after writing into the translate folder)."""
+        self._cache.clear()
     
     def discover_all_languages(self) -> list[LanguageFiles]:
         """
@@ -54,32 +86,33 @@ class FileDiscoveryService:
         Returns:
             List of LanguageFiles, one per language folder found
         """
-        result: list[LanguageFiles] = []
+        cached = self._cache.get(("all",))
+        if cached is not None:
+            return cached
         
-        if not self.translate_path.exists():
-            return result
+        result: list[LanguageFiles] = []
         
         # Iterate through language folders
-        for item in sorted(self.translate_path.iterdir()):
-            if item.is_dir():
-                lang_key = item.name.lower()
-                
-                if lang_key in LANGUAGE_MAP:
-                    lang_name, lang_code = LANGUAGE_MAP[lang_key]
-                else:
-                    # Unknown language, use folder name
-                    lang_name = item.name.title()
-                    lang_code = LanguageCode.HINDI  # Default fallback
-                
-                files = self._discover_files_in_folder(item, lang_key)
-                
-                if files:  # Only include languages with files
-                    result.append(LanguageFiles(
-                        language=lang_name,
-                        language_code=lang_code.value if isinstance(lang_code, LanguageCode) else lang_code,
-                        files=files
-                    ))
+        for item in self._scan_language_folders():
+            lang_key = item.name.lower()
+            
+            if lang_key in LANGUAGE_MAP:
+                lang_name, lang_code = LANGUAGE_MAP[lang_key]
+            else:
+                # Unknown language, use folder name
+                lang_name = item.name.title()
+                lang_code = LanguageCode.HINDI  # Default fallback
+            
+            files = self._discover_files_in_folder(Path(item.path), lang_key)
+            
+            if files:  # Only include languages with files
+                result.append(LanguageFiles(
+                    language=lang_name,
+                    language_code=lang_code.value if isinstance(lang_code, LanguageCode) else lang_code,
+                    files=files
+                ))
         
+        self._cache[("all",)] = result
         return result
     
     def discover_files_for_language(self, language: str) -> list[FileInfo]:
@@ -92,32 +125,89 @@ class FileDiscoveryService:
         Returns:
             List of FileInfo for the language
         """
+        key = ("language", language)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
         lang_path = self.translate_path / language.lower()
         
         if not lang_path.exists():
             return []
         
-        return self._discover_files_in_folder(lang_path, language)
+        files = self._discover_files_in_folder(lang_path, language)
+        self._cache[key] = files
+        return files
+    
+    def _scan_language_folders(self) -> list[os.DirEntry]:
+        """List language folders in the translate directory, sorted by name."""
+        try:
+            with os.scandir(self.translate_path) as entries:
+                return sorted((e for e in entries if e.is_dir()), key=lambda e: e.name)
+        except FileNotFoundError:
+            return []
+    
+    def _scan_markdown_files(self, folder: Path) -> list[os.DirEntry]:
+        """List markdown files in a folder, sorted by name."""
+        try:
+            with os.scandir(folder) as entries:
+                return sorted(
+                    (e for e in entries if e.name.endswith(".md") and e.is_file()),
+                    key=lambda e: e.name
+                )
+        except (FileNotFoundError, NotADirectoryError):
+            return []
     
     def _discover_files_in_folder(self, folder: Path, language: str) -> list[FileInfo]:
         """Discover markdown files in a folder."""
         files: list[FileInfo] = []
         
-        for file_path in sorted(folder.glob("*.md")):
-            if file_path.is_file():
-                # Try to extract title from file
-                title = self._extract_title(file_path)
-                
-                files.append(FileInfo(
-                    filename=file_path.name,
-                    language=language,
-                    path=str(file_path),
-                    size_bytes=file_path.stat().st_size,
-                    title=title
-                ))
+        # scandir reports file type without extra syscalls and stats each entry once
+        entries = self._scan_markdown_files(folder)
+        stats = [entry.stat() for entry in entries]
+        titles = self._titles_for([
+            (entry.path, stat.st_mtime_ns, stat.st_size) for entry, stat in zip(entries, stats)
+        ])
+        
+        for entry, stat, title in zip(entries, stats, titles):
+            files.append(FileInfo(
+                filename=entry.name,
+                language=language,
+                path=entry.path,
+                size_bytes=stat.st_size,
+                title=title
+            ))
         
         return files
     
+    def _titles_for(self, keys: list[tuple[str, int, int]]) -> list[Optional[str]]:
+        """
+        Look up titles for (path, mtime_ns, size) keys, reading changed files in parallel.
+        
+        Args:
+            keys: One key per file, in listing order
+            
+        Returns:
+            Titles in the same order as `keys`
+        """
+        found: dict[tuple[str, int, int], Optional[str]] = {}
+        missing = []
+        for key in keys:
+            if key in self._title_cache:
+                found[key] = self._title_cache[key]
+            else:
+                missing.append(key)
+        
+        if len(missing) > 1:
+            titles = _get_title_executor().map(lambda key: self._extract_title(Path(key[0])), missing)
+        else:
+            titles = (self._extract_title(Path(key[0])) for key in missing)
+        
+        for key, title in zip(missing, titles):
+            found[key] = self._title_cache[key] = title
+        
+        return [found[key] for key in keys]
+    
     def _extract_title(self, file_path: Path) -> Optional[str]:
         """
         Extract title from markdown file (first H1 heading).
@@ -129,19 +219,19 @@ class FileDiscoveryService:
             Title string or None if not found
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('# '):
-                        return line[2:].strip()
-                    # Stop after first 20 lines to avoid reading whole file
-                    if f.tell() > 2000:
-                        break
-        except Exception:
-            pass
-        
-        return None
-    
+            # Unbuffered, so only the scan budget is read (a buffered reader
+            # would fill its larger internal buffer first)
+            with open(file_path, 'rb', buffering=0) as f:
+                head = f.read(_TITLE_SCAN_BYTES)
+        except OSError:
+            return None
+
+        match = _H1_TITLE_RE.search(head)
+        if not match:
+            return None
+        # A title cut by the scan limit may end in a partial UTF-8 sequence
+        return match.group(1).decode('utf-8', errors='ignore').strip() or None
+
     def get_file_content(self, file_path: str) -> str:
         """
         Get the content of a markdown file.
@@ -152,6 +242,57 @@ class FileDiscoveryService:
         Returns:
             File content as string
         """
+        path = self._validate_path(file_path)
+        return path.read_text(encoding='utf-8')
+    
+    def get_file_etag(self, file_path: str) -> str:
+        """
+        Get a weak ETag for a markdown file from a single stat() call.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            ETag header value derived from mtime and size
+        """
+        st = self._validate_path(file_path).stat()
+        return f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    
+    def get_listing_etag(self, language: Optional[str] = None) -> str:
+        """
+        Get a weak ETag for the file listing (all languages or one).
+        
+        Only directory entries are stat'ed; file contents are not read.
+        
+        Args:
+            language: Optional language folder to restrict the listing to
+            
+        Returns:
+            ETag header value derived from names, mtimes and sizes
+        """
+        key = ("etag", language)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        digest = hashlib.blake2b(digest_size=8)
+        
+        if language is not None:
+            folders = [self.translate_path / language.lower()]
+        else:
+            folders = [Path(e.path) for e in self._scan_language_folders()]
+        
+        for folder in folders:
+            for entry in self._scan_markdown_files(folder):
+                st = entry.stat()
+                digest.update(f"{folder.name}/{entry.name}:{st.st_mtime_ns}:{st.st_size};".encode('utf-8'))
+        
+        etag = f'W/"{digest.hexdigest()}"'
+        self._cache[key] = etag
+        return etag
+    
+    def _validate_path(self, file_path: str) -> Path:
+        """Ensure a file exists and lies within the translate directory."""
         path = Path(file_path)
         
         # Security check: ensure file is within translate directory
@@ -163,7 +304,7 @@ class FileDiscoveryService:
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        return path.read_text(encoding='utf-8')
+        return path
     
     def ensure_speech_output_dir(self) -> Path:
         """
@@ -0,0 +1,135 @@
+"""
+Job Store
+
+Bounded in-memory store of generation jobs with a single-file JSON snapshot,
+so completed jobs (and their exports) survive a restart.
+"""
+import asyncio
+import logging
+import os
+from pathlib import Path
+
+import orjson
+from cachetools import TTLCache
+
+from models.schemas import APICallStats, GenerateTTSResponse, ParsedDocument
+
+logger = logging.getLogger('tts_backend.job_store')
+
+
+class JobStore(TTLCache):
+    """
+    TTL/LRU cache of job records (`{"document", "response", "chunk_keys",
+    "api_stats", "exports"}`).
+
+    Writes mark the store dirty; `snapshot` only rewrites the file when
+    something changed. Callers that mutate a record in place should call
+    `mark_dirty`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.dirty = False
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.dirty = True
+
+    def mark_dirty(self) -> None:
+        """Flag an in-place change to a stored job."""
+        self.dirty = True
+
+    def _serialize(self) -> bytes:
+        jobs = {}
+        for job_id, job in list(self.items()):
+            if "document" not in job or "response" not in job:
+                continue
+            document = job["document"].model_dump(mode="json")
+            for chunk in document["chunks"]:
+                # Most paragraphs have no markup left to strip; restore
+                # repopulates raw_text from text
+                if chunk["raw_text"] == chunk["text"]:
+                    del chunk["raw_text"]
+            jobs[job_id] = {
+                "document": document,
+                # Chunk audio (audio_bytes) is never serialized; it lives in the
+                # TTS service and audio cache
+                "response": job["response"].model_dump(mode="json"),
+                # Audio cache keys and call stats let a restored job export
+                # from the audio cache and report its summary
+                "chunk_keys": job.get("chunk_keys", {}),
+                "api_stats": [stats.model_dump(mode="json") for stats in job.get("api_stats", [])],
+                "exports": {
+                    fmt: [str(path), *details]
+                    for fmt, (path, *details) in job.get("exports", {}).items()
+                },
+            }
+        return orjson.dumps(jobs, option=orjson.OPT_NON_STR_KEYS)
+
+    async def snapshot(self, path: Path) -> bool:
+        """
+        Write all jobs to `path` if anything changed since the last snapshot.
+
+        Returns:
+            True if the file was written
+        """
+        if not self.dirty:
+            return False
+
+        self.dirty = False
+        data = self._serialize()
+        await asyncio.to_thread(_write_atomic, path, data)
+        logger.debug("Snapshot of %s jobs written to %s", len(self), path)
+        return True
+
+    def restore(self, path: Path) -> int:
+        """
+        Load jobs from a snapshot written by `snapshot`.
+
+        Returns:
+            Number of jobs restored
+        """
+        try:
+            jobs = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return 0
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable job snapshot %s: %s", path, e)
+            return 0
+
+        restored = 0
+        for job_id, job in jobs.items():
+            try:
+                for chunk in job["document"]["chunks"]:
+                    chunk.setdefault("raw_text", chunk["text"])
+                response = GenerateTTSResponse.model_validate(job["response"])
+                record = {
+                    "document": ParsedDocument.model_validate(job["document"]),
+                    "response": response,
+                    "chunk_keys": {int(chunk_id): key for chunk_id, key in job.get("chunk_keys", {}).items()},
+                    "api_stats": [APICallStats.model_validate(stats) for stats in job.get("api_stats", [])],
+                    "exports": {
+                        fmt: (Path(file_path), *details)
+                        for fmt, (file_path, *details) in job.get("exports", {}).items()
+                    },
+                }
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                logger.warning("Skipping job %s from snapshot: %s", job_id, e)
+                continue
+            # Generation does not survive a restart, so a job snapshotted
+            # mid-run would otherwise report "processing" forever
+            if response.status == "processing":
+                response.status = "failed"
+                response.error = "Generation was interrupted by a server restart"
+            super().__setitem__(job_id, record)
+            restored += 1
+
+        return restored
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write `data` to `path` via a temporary file so readers never see a partial snapshot."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
@@ -4,9 +4,15 @@ Markdown Parser Service
 Parses markdown documents into structured chunks optimized for TTS.
 Handles headings, paragraphs, bullet points with appropriate settings.
 """
+import hashlib
 import re
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from cachetools import LRUCache
+
 from models.schemas import (
     ChunkType,
     ContentChunk,
@@ -15,6 +21,94 @@ from models.schemas import (
 from config import get_settings
 
 
+# ============================================================================
+# Markdown patterns, compiled once at import and shared by all parsers
+# ============================================================================
+
+# H1-H3 in one anchored alternation; the number of '#' picks the level.
+# H4 and deeper are read as paragraphs.
+_HEADING_RE = re.compile(r'^(#{1,3})\s+(.+)$', re.MULTILINE)
+_HEADING_TYPES = (ChunkType.HEADING_H1, ChunkType.HEADING_H2, ChunkType.HEADING_H3)
+
+_BULLET_MARKERS = '*-+'
+_BULLET_RE = re.compile(r'^[\*\-\+]\s+(.+)$', re.MULTILINE)
+_NUMBERED_RE = re.compile(r'^\d+\.\s+(.+)$', re.MULTILINE)
+# Union of the bullet and numbered patterns, to find list blocks in one scan:
+# the first line is matched in place, later lines after their '\n', which
+# gives the search a literal to skip ahead to instead of trying every offset
+_LIST_ITEM_RE = re.compile(r'(?:[\*\-\+]|\d+\.)\s+.')
+_LATER_LIST_ITEM_RE = re.compile(r'\n(?:[\*\-\+]|\d+\.)\s+.')
+_CODE_BLOCK_RE = re.compile(r'```[\s\S]*?```', re.MULTILINE)
+_BLOCKQUOTE_RE = re.compile(r'^>\s+(.+)$', re.MULTILINE)
+
+# Markdown syntax (and escaping backslashes) stripped by _clean_for_tts, as
+# one alternation so the text is scanned once. Images precede links and the
+# emphasis branches go from three asterisks down to one, so the longer
+# construct wins at a given position.
+_CLEAN_RE = re.compile(
+    r'(?P<image>!\[([^\]]*)\]\([^)]+\))'
+    r'|(?P<link>\[([^\]]+)\]\([^)]+\))'
+    r'|(?P<bold_italic>\*\*\*([^*]+)\*\*\*)'
+    r'|(?P<bold>\*\*([^*]+)\*\*)'
+    r'|(?P<italic>\*([^*]+)\*)'
+    r'|(?P<code>`([^`]+)`)'
+    r'|(?P<rule>^(?:---+|\*\*\*+|___+)$)'
+    r'|(?P<escape>\\)'
+    r'|(?P<space>\s+)',
+    re.MULTILINE
+)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# Anything _CLEAN_RE would change besides surrounding whitespace: markup
+# characters, whitespace other than single spaces, or a text that is a rule
+_MARKUP_RE = re.compile(r'[*\[`!\\]|\s\s|[^\S ]|\A(?:-{3,}|_{3,})\Z')
+# Sentence endings: period, exclamation, question mark and Hindi purna viram,
+# then the whitespace that separates sentences. Matching the terminator itself
+# rather than a lookbehind lets the engine jump straight to candidate chars.
+_SENTENCE_END_RE = re.compile(r'[.!?।]\s+')
+
+# Block kinds produced by MarkdownParser._tokenize besides the heading types
+_LIST = ChunkType.BULLET
+_QUOTE = ChunkType.BLOCKQUOTE
+_PARAGRAPH = ChunkType.PARAGRAPH
+
+
+def _clean_match(match: re.Match) -> str:
+    """Replacement for one _CLEAN_RE match."""
+    kind = match.lastgroup
+    if kind == 'space':
+        return ' '
+    if kind == 'rule' or kind == 'escape':
+        return ''
+    # Keep the inner text (alt text, link text, emphasised or quoted code)
+    # and clean it too, since markup nests, e.g. [**bold link**](url)
+    inner = match.group(match.lastindex + 1)
+    return _CLEAN_RE.sub(_clean_match, inner) if inner else ''
+
+
+@lru_cache(maxsize=2048)
+def _clean_text(text: str) -> str:
+    """
+    Strip markdown syntax from text; the body of MarkdownParser._clean_for_tts.
+
+    Cleaning depends on the text alone, so results are memoized: headings,
+    list items and boilerplate lines repeat across documents and re-parses.
+    """
+    # Plain prose needs no substitution pass at all
+    if not _MARKUP_RE.search(text):
+        return text.strip()
+
+    text = _CLEAN_RE.sub(_clean_match, text)
+
+    # Whitespace runs are already single spaces, except where a removed
+    # construct (e.g. an empty image, a rule line or a backslash) sat
+    # between two
+    if '  ' in text:
+        text = _WHITESPACE_RE.sub(' ', text)
+
+    return text.strip()
+
+
 class MarkdownParser:
     """
     Parses markdown files into TTS-optimized chunks.
@@ -30,24 +124,19 @@ class MarkdownParser:
         self.max_chunk_size = max_chunk_size
         self.settings = get_settings()
 
-        # Regex patterns for markdown elements
-        self.patterns = {
-            'h1': re.compile(r'^#\s+(.+)$', re.MULTILINE),
-            'h2': re.compile(r'^##\s+(.+)$', re.MULTILINE),
-            'h3': re.compile(r'^###\s+(.+)$', re.MULTILINE),
-            'h4': re.compile(r'^####\s+(.+)$', re.MULTILINE),
-            'bullet': re.compile(r'^[\*\-\+]\s+(.+)$', re.MULTILINE),
-            'numbered': re.compile(r'^\d+\.\s+(.+)$', re.MULTILINE),
-            'code_block': re.compile(r'```[\s\S]*?```', re.MULTILINE),
-            'inline_code': re.compile(r'`[^`]+`'),
-            'bold': re.compile(r'\*\*([^*]+)\*\*'),
-            'italic': re.compile(r'\*([^*]+)\*'),
-            'link': re.compile(r'\[([^\]]+)\]\([^)]+\)'),
-            'image': re.compile(r'!\[([^\]]*)\]\([^)]+\)'),
-            'blockquote': re.compile(r'^>\s+(.+)$', re.MULTILINE),
-            'horizontal_rule': re.compile(r'^---+$|^\*\*\*+$|^___+$', re.MULTILINE),
+        # (loudness boost, pause after) per heading type, resolved once
+        self._heading_styles = {
+            ChunkType.HEADING_H1: (self.settings.heading_h1_loudness_boost, self.settings.pause_after_h1_ms),
+            ChunkType.HEADING_H2: (self.settings.heading_h2_loudness_boost, self.settings.pause_after_h2_ms),
+            ChunkType.HEADING_H3: (self.settings.heading_h3_loudness_boost, self.settings.pause_after_h3_ms),
         }
 
+        # Parsed documents keyed by (path, mtime_ns, size, language) for files
+        # and (content digest, filename, language) for content; parsing may
+        # run in threadpool workers, hence the lock
+        self._document_cache: LRUCache = LRUCache(maxsize=64)
+        self._document_cache_lock = threading.Lock()
+
     def parse_file(self, file_path: str | Path, language: str = "hi") -> ParsedDocument:
         """
         Parse a markdown file into a structured document with chunks.
@@ -61,37 +150,27 @@ class MarkdownParser:
         """
         file_path = Path(file_path)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        content = file_path.read_text(encoding='utf-8')
+        # Reuse the previous parse while the file is unchanged on disk; stat
+        # raises FileNotFoundError itself, so no separate exists() check
+        stat = file_path.stat()
+        cache_key = (str(file_path), stat.st_mtime_ns, stat.st_size, language)
+        with self._document_cache_lock:
+            cached = self._document_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Decode the raw bytes; only pay for newline translation (which
+        # read_text always does) when the file actually has carriage returns
+        content = file_path.read_bytes().decode('utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         filename = file_path.name
 
-        # Parse into chunks
-        chunks = self._parse_content(content)
-
-        # Extract title (first H1)
-        title = None
-        for chunk in chunks:
-            if chunk.type == ChunkType.HEADING_H1:
-                title = chunk.text
-                break
-
-        # Calculate totals
-        total_chars = sum(c.char_count for c in chunks)
-
-        # Estimate duration (rough: ~150 words per minute, ~5 chars per word)
-        estimated_duration = (total_chars / 5) / 150 * 60
+        document = self._build_document(content, filename, language)
 
-        return ParsedDocument(
-            filename=filename,
-            language=language,
-            title=title,
-            chunks=chunks,
-            total_chunks=len(chunks),
-            total_characters=total_chars,
-            estimated_duration_seconds=estimated_duration
-        )
+        with self._document_cache_lock:
+            self._document_cache[cache_key] = document
+        return document
 
     def parse_content(self, content: str, filename: str = "uploaded.md", language: str = "hi") -> ParsedDocument:
         """
@@ -105,18 +184,35 @@ class MarkdownParser:
         Returns:
             ParsedDocument with chunks ready for TTS
         """
-        # Parse into chunks
-        chunks = self._parse_content(content)
+        # Re-parsing the same upload (retries, re-reads) reuses the document;
+        # keyed by digest so the cache does not hold on to the content itself
+        cache_key = (
+            hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest(),
+            filename,
+            language,
+        )
+        with self._document_cache_lock:
+            cached = self._document_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Extract title (first H1)
+        document = self._build_document(content, filename, language)
+
+        with self._document_cache_lock:
+            self._document_cache[cache_key] = document
+        return document
+
+    def _build_document(self, content: str, filename: str, language: str) -> ParsedDocument:
+        """Parse content into chunks and wrap them with document-level totals."""
+        # Build the chunk list and its totals in the same pass as parsing
+        chunks: list[ContentChunk] = []
         title = None
-        for chunk in chunks:
-            if chunk.type == ChunkType.HEADING_H1:
+        total_chars = 0
+        for chunk in self._iter_chunks(content):
+            chunks.append(chunk)
+            total_chars += chunk.char_count
+            if title is None and chunk.type == ChunkType.HEADING_H1:
                 title = chunk.text
-                break
-
-        # Calculate totals
-        total_chars = sum(c.char_count for c in chunks)
 
         # Estimate duration (rough: ~150 words per minute, ~5 chars per word)
         estimated_duration = (total_chars / 5) / 150 * 60
@@ -131,96 +227,115 @@ class MarkdownParser:
             estimated_duration_seconds=estimated_duration
         )
 
-    def _parse_content(self, content: str) -> list[ContentChunk]:
+    def _iter_chunks(self, content: str) -> Iterator[ContentChunk]:
         """
-        Parse markdown content into chunks.
+        Parse markdown content into chunks, yielding them block by block.
 
         Strategy:
-        1. Split by double newlines to get blocks
+        1. Split at blank lines to get blocks
         2. Identify block types (heading, paragraph, bullet, etc.)
         3. Clean markdown syntax for TTS
         4. Split long content respecting sentence boundaries
         """
-        chunks: list[ContentChunk] = []
         chunk_id = 0
 
-        # Remove code blocks first (we'll skip them or add placeholder)
-        content_no_code = self.patterns['code_block'].sub('[Code block skipped]', content)
+        for kind, text, block, lines in self._tokenize(content):
+            if kind == _LIST:
+                block_chunks = self._create_list_chunks(chunk_id, lines)
+            elif kind == _QUOTE:
+                block_chunks = self._create_paragraph_chunks(
+                    chunk_id, self._clean_for_tts(self._unquote(lines)), block
+                )
+            elif kind == _PARAGRAPH:
+                block_chunks = self._create_paragraph_chunks(
+                    chunk_id, self._clean_for_tts(text), block
+                )
+            else:
+                block_chunks = [self._create_heading_chunk(
+                    chunk_id, self._clean_for_tts(text), block, kind
+                )]
 
-        # Split into blocks by double newlines
-        blocks = re.split(r'\n\s*\n', content_no_code)
+            yield from block_chunks
+            chunk_id += len(block_chunks)
 
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
-
-            # Identify block type and process
-            block_chunks = self._process_block(block, chunk_id)
+    def _tokenize(self, content: str) -> Iterator[tuple[ChunkType, str, str, list[str]]]:
+        """
+        Split content into blocks and classify each one in a single pass.
+
+        Lines are walked once and grouped into blocks at blank lines; the
+        block's lines are handed on so list and quote handling need not
+        split the block again. The first character of a block decides which
+        pattern (if any) is tried, so each block is matched against at most
+        one regex before its chunks are built.
+
+        Yields:
+            (kind, text, block, lines) where kind is a heading, bullet (list),
+            blockquote or paragraph ChunkType, text is the heading title or
+            the block itself, and lines are the block's lines
+        """
+        # Remove code blocks first (we'll skip them or add placeholder)
+        content_no_code = _CODE_BLOCK_RE.sub('[Code block skipped]', content)
+
+        # Blank (empty or whitespace-only) lines separate blocks
+        lines: list[str] = []
+        for line in content_no_code.split('\n'):
+            if line and not line.isspace():
+                lines.append(line)
+            elif lines:
+                yield self._classify_block(lines)
+                lines = []
+        if lines:
+            yield self._classify_block(lines)
+
+    @staticmethod
+    def _classify_block(lines: list[str]) -> tuple[ChunkType, str, str, list[str]]:
+        """Classify one block of non-blank lines (see _tokenize)."""
+        lines[0] = lines[0].lstrip()
+        lines[-1] = lines[-1].rstrip()
+        block = '\n'.join(lines)
+
+        first = block[0]
+        if first == '#':
+            match = _HEADING_RE.match(block)
+            if match:
+                return _HEADING_TYPES[len(match.group(1)) - 1], match.group(2), block, lines
+
+        # A block holding any bullet or numbered line is read as a list
+        if (
+            (first in _BULLET_MARKERS or first.isdecimal()) and _LIST_ITEM_RE.match(block)
+        ) or _LATER_LIST_ITEM_RE.search(block):
+            return _LIST, block, block, lines
+        if first == '>' and _BLOCKQUOTE_RE.match(block):
+            return _QUOTE, block, block, lines
+        return _PARAGRAPH, block, block, lines
+
+    def _create_list_chunks(self, start_id: int, lines: list[str]) -> list[ContentChunk]:
+        """Create one bullet chunk per list item in a block; other lines are dropped."""
+        chunks: list[ContentChunk] = []
 
-            for chunk in block_chunks:
-                chunks.append(chunk)
-                chunk_id += 1
+        for line in lines:
+            line = line.strip()
 
-        return chunks
+            if line[0] in _BULLET_MARKERS:
+                match = _BULLET_RE.match(line)
+            else:
+                match = _NUMBERED_RE.match(line)
 
-    def _process_block(self, block: str, start_id: int) -> list[ContentChunk]:
-        """Process a single block of content."""
-        chunks: list[ContentChunk] = []
-        current_id = start_id
-
-        # Check for headings
-        for level, (pattern_key, chunk_type) in enumerate([
-            ('h1', ChunkType.HEADING_H1),
-            ('h2', ChunkType.HEADING_H2),
-            ('h3', ChunkType.HEADING_H3),
-        ], start=1):
-            match = self.patterns[pattern_key].match(block)
             if match:
                 text = self._clean_for_tts(match.group(1))
-                chunks.append(self._create_heading_chunk(
-                    current_id, text, block, chunk_type
-                ))
-                return chunks
-
-        # Check for bullet points (may have multiple in one block)
-        if self.patterns['bullet'].search(block) or self.patterns['numbered'].search(block):
-            lines = block.split('\n')
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                bullet_match = self.patterns['bullet'].match(line)
-                numbered_match = self.patterns['numbered'].match(line)
-
-                if bullet_match:
-                    text = self._clean_for_tts(bullet_match.group(1))
-                    chunks.append(self._create_bullet_chunk(current_id, text, line))
-                    current_id += 1
-                elif numbered_match:
-                    text = self._clean_for_tts(numbered_match.group(1))
-                    chunks.append(self._create_bullet_chunk(current_id, text, line))
-                    current_id += 1
-            return chunks
-
-        # Check for blockquote
-        if self.patterns['blockquote'].match(block):
-            lines = block.split('\n')
-            quote_text = ' '.join(
-                self.patterns['blockquote'].match(line).group(1) if self.patterns['blockquote'].match(line) else line
-                for line in lines if line.strip()
-            )
-            text = self._clean_for_tts(quote_text)
-            chunks.extend(self._create_paragraph_chunks(current_id, text, block))
-            return chunks
-
-        # Default: paragraph
-        text = self._clean_for_tts(block)
-        chunks.extend(self._create_paragraph_chunks(current_id, text, block))
+                chunks.append(self._create_bullet_chunk(start_id + len(chunks), text, line))
 
         return chunks
 
+    @staticmethod
+    def _unquote(lines: list[str]) -> str:
+        """Join a blockquote's lines, dropping the '>' markers."""
+        quote_lines = []
+        for line in lines:
+            match = _BLOCKQUOTE_RE.match(line)
+            quote_lines.append(match.group(1) if match else line)
+        return ' '.join(quote_lines)
+
     def _create_heading_chunk(
         self,
         chunk_id: int,
@@ -229,17 +344,7 @@ class MarkdownParser:
         chunk_type: ChunkType
     ) -> ContentChunk:
         """Create a heading chunk with appropriate settings."""
-        settings = get_settings()
-
-        if chunk_type == ChunkType.HEADING_H1:
-            loudness = settings.heading_h1_loudness_boost
-            pause = settings.pause_after_h1_ms
-        elif chunk_type == ChunkType.HEADING_H2:
-            loudness = settings.heading_h2_loudness_boost
-            pause = settings.pause_after_h2_ms
-        else:
-            loudness = settings.heading_h3_loudness_boost
-            pause = settings.pause_after_h3_ms
+        loudness, pause = self._heading_styles[chunk_type]
 
         return ContentChunk(
             id=chunk_id,
@@ -268,6 +373,24 @@ class MarkdownParser:
             loudness_boost=1.0
         )
 
+    def _make_paragraph_chunk(
+        self,
+        chunk_id: int,
+        text: str,
+        raw_text: str,
+        char_count: int
+    ) -> ContentChunk:
+        """Create a single paragraph chunk; char_count is len(text), already known to the caller."""
+        return ContentChunk(
+            id=chunk_id,
+            type=ChunkType.PARAGRAPH,
+            text=text,
+            raw_text=raw_text,
+            char_count=char_count,
+            pause_after_ms=self.settings.pause_after_paragraph_ms,
+            loudness_boost=1.0
+        )
+
     def _create_paragraph_chunks(
         self,
         start_id: int,
@@ -279,89 +402,52 @@ class MarkdownParser:
 
         Respects max_chunk_size while trying to split at sentence boundaries.
         """
+        max_size = self.max_chunk_size
+        text_len = len(text)
+
+        if text_len <= max_size:
+            return [self._make_paragraph_chunk(start_id, text, raw_text, text_len)]
+
         chunks: list[ContentChunk] = []
-        current_id = start_id
-
-        if len(text) <= self.max_chunk_size:
-            chunks.append(ContentChunk(
-                id=current_id,
-                type=ChunkType.PARAGRAPH,
-                text=text,
-                raw_text=raw_text,
-                char_count=len(text),
-                pause_after_ms=self.settings.pause_after_paragraph_ms,
-                loudness_boost=1.0
-            ))
-            return chunks
 
-        # Need to split - try sentence boundaries first
-        sentences = self._split_into_sentences(text)
-        current_chunk = ""
+        # Sentences of the chunk being built and its length once joined by
+        # spaces; the string is only materialized when the chunk is emitted
+        current_parts: list[str] = []
+        current_len = 0
+
+        def flush() -> None:
+            nonlocal current_len
+            if current_parts:
+                joined = ' '.join(current_parts)
+                chunks.append(self._make_paragraph_chunk(
+                    start_id + len(chunks), joined, joined, current_len
+                ))
+                current_parts.clear()
+                current_len = 0
 
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
+        # Need to split - try sentence boundaries first
+        for sentence in self._iter_sentences(text):
+            sentence_len = len(sentence)
 
             # If single sentence exceeds limit, split by characters
-            if len(sentence) > self.max_chunk_size:
-                if current_chunk:
-                    chunks.append(ContentChunk(
-                        id=current_id,
-                        type=ChunkType.PARAGRAPH,
-                        text=current_chunk.strip(),
-                        raw_text=current_chunk.strip(),
-                        char_count=len(current_chunk.strip()),
-                        pause_after_ms=self.settings.pause_after_paragraph_ms,
-                        loudness_boost=1.0
-                    ))
-                    current_id += 1
-                    current_chunk = ""
-
-                # Split long sentence
-                for i in range(0, len(sentence), self.max_chunk_size):
-                    part = sentence[i:i + self.max_chunk_size]
-                    chunks.append(ContentChunk(
-                        id=current_id,
-                        type=ChunkType.PARAGRAPH,
-                        text=part,
-                        raw_text=part,
-                        char_count=len(part),
-                        pause_after_ms=self.settings.pause_after_paragraph_ms,
-                        loudness_boost=1.0
+            if sentence_len > max_size:
+                flush()
+                for i in range(0, sentence_len, max_size):
+                    part = sentence[i:i + max_size]
+                    chunks.append(self._make_paragraph_chunk(
+                        start_id + len(chunks), part, part, min(max_size, sentence_len - i)
                     ))
-                    current_id += 1
                 continue
 
             # Check if adding sentence exceeds limit
-            test_chunk = f"{current_chunk} {sentence}".strip()
-            if len(test_chunk) > self.max_chunk_size:
-                if current_chunk:
-                    chunks.append(ContentChunk(
-                        id=current_id,
-                        type=ChunkType.PARAGRAPH,
-                        text=current_chunk.strip(),
-                        raw_text=current_chunk.strip(),
-                        char_count=len(current_chunk.strip()),
-                        pause_after_ms=self.settings.pause_after_paragraph_ms,
-                        loudness_boost=1.0
-                    ))
-                    current_id += 1
-                current_chunk = sentence
-            else:
-                current_chunk = test_chunk
+            if current_parts and current_len + 1 + sentence_len > max_size:
+                flush()
+
+            current_len += sentence_len + 1 if current_parts else sentence_len
+            current_parts.append(sentence)
 
         # Don't forget the last chunk
-        if current_chunk.strip():
-            chunks.append(ContentChunk(
-                id=current_id,
-                type=ChunkType.PARAGRAPH,
-                text=current_chunk.strip(),
-                raw_text=current_chunk.strip(),
-                char_count=len(current_chunk.strip()),
-                pause_after_ms=self.settings.pause_after_paragraph_ms,
-                loudness_boost=1.0
-            ))
+        flush()
 
         return chunks
 
@@ -374,11 +460,21 @@ class MarkdownParser:
         - Hindi Purna Viram (।)
         - Abbreviations and numbers
         """
-        # Pattern for sentence endings
-        # Includes period, exclamation, question mark, and Hindi purna viram
-        pattern = r'(?<=[.!?।])\s+'
-        sentences = re.split(pattern, text)
-        return [s.strip() for s in sentences if s.strip()]
+        return list(self._iter_sentences(text))
+
+    def _iter_sentences(self, text: str) -> Iterator[str]:
+        """Yield the stripped, non-empty sentences of text without building a list."""
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(text):
+            # Keep the terminator with its sentence
+            sentence = text[start:match.start() + 1].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+
+        sentence = text[start:].strip()
+        if sentence:
+            yield sentence
 
     def _clean_for_tts(self, text: str) -> str:
         """
@@ -391,35 +487,21 @@ class MarkdownParser:
         - Inline code (reads as is)
         - Special characters
         """
-        # Remove bold markers
-        text = self.patterns['bold'].sub(r'\1', text)
+        return _clean_text(text)
 
-        # Remove italic markers
-        text = self.patterns['italic'].sub(r'\1', text)
 
-        # Replace links with just the text
-        text = self.patterns['link'].sub(r'\1', text)
-
-        # Replace images with alt text or skip
-        text = self.patterns['image'].sub(lambda m: m.group(1) if m.group(1) else '', text)
-
-        # Remove inline code backticks
-        text = self.patterns['inline_code'].sub(lambda m: m.group(0)[1:-1], text)
-
-        # Remove horizontal rules
-        text = self.patterns['horizontal_rule'].sub('', text)
-
-        # Clean up multiple spaces
-        text = re.sub(r'\s+', ' ', text)
-
-        # Clean up special markdown characters
-        text = text.replace('\\', '')
-
-        return text.strip()
+@lru_cache(maxsize=16)
+def _parser_for_size(max_chunk_size: int) -> MarkdownParser:
+    return MarkdownParser(max_chunk_size=max_chunk_size)
 
 
 def create_parser(max_chunk_size: Optional[int] = None) -> MarkdownParser:
-    """Factory function to create a parser instance."""
+    """
+    Factory function returning the parser for a chunk size.
+
+    Parsers hold no per-call state, so one instance per size is shared,
+    along with its parsed-document cache, by every caller.
+    """
     settings = get_settings()
     size = max_chunk_size or settings.max_chunk_size
-    return MarkdownParser(max_chunk_size=size)
+    return _parser_for_size(size)
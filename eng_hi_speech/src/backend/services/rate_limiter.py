@@ -0,0 +1,117 @@
+"""
+Rate Limiter
+
+Token buckets used to keep outgoing Sarvam AI calls within the
+requests-per-minute and characters-per-minute quotas.
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket for async callers.
+
+    Acquiring never takes a lock: tokens are reserved immediately (the
+    balance may go negative) and the caller sleeps until its reservation
+    is covered by refill. Because there is no await between refilling and
+    reserving, this is safe for concurrent coroutines on one event loop and
+    callers are served in arrival order.
+
+    Tokens are spent when `acquire` returns, before the caller's request is
+    made; a caller cancelled while still waiting gets its reservation back.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: Tokens added per minute; 0 or less disables the bucket
+            capacity: Maximum burst size (defaults to one second of tokens,
+                at least 1, so a cold start does not fire a minute's quota at once)
+        """
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate_per_second)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the bucket limits anything."""
+        return self.rate_per_second > 0
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Wait until `amount` tokens are available and consume them.
+
+        Amounts above capacity are allowed; the caller waits for the excess
+        to refill.
+
+        Args:
+            amount: Number of tokens to consume
+        """
+        if not self.enabled:
+            return
+
+        self._refill()
+        self._tokens -= amount
+
+        if self._tokens < 0:
+            try:
+                await asyncio.sleep(-self._tokens / self.rate_per_second)
+            except asyncio.CancelledError:
+                self.release(amount)
+                raise
+
+    def release(self, amount: float = 1.0) -> None:
+        """Return tokens reserved by a caller that gave up before using them."""
+        if not self.enabled:
+            return
+
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def hold(self, seconds: float) -> None:
+        """
+        Serve no caller for the next `seconds`.
+
+        For when the server reports the quota spent before the local
+        estimate does. Callers already sleeping on an earlier reservation
+        are not delayed further.
+
+        Args:
+            seconds: How long to withhold tokens
+        """
+        if not self.enabled or seconds <= 0:
+            return
+
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate_per_second)
+
+
+class RateLimiter:
+    """Combined requests-per-minute and characters-per-minute limiter."""
+
+    def __init__(self, requests_per_minute: float = 0, characters_per_minute: float = 0):
+        self.requests = TokenBucket(requests_per_minute)
+        self.characters = TokenBucket(characters_per_minute)
+
+    async def acquire(self, characters: int) -> None:
+        """Wait for one request slot and `characters` worth of quota."""
+        await self.requests.acquire(1)
+        try:
+            await self.characters.acquire(characters)
+        except asyncio.CancelledError:
+            # The request is never made, so its slot goes back too
+            self.requests.release(1)
+            raise
+
+    def hold(self, seconds: float) -> None:
+        """Pause all request slots for `seconds`, e.g. after a 429 with Retry-After."""
+        self.requests.hold(seconds)
@@ -4,18 +4,23 @@ TTS Service using Sarvam AI
 Handles text-to-speech conversion using the Sarvam AI API.
 Supports chunked processing, audio concatenation, and export.
 """
-import base64
+import binascii
+import contextlib
 import uuid
+import wave
 import asyncio
 import io
+import random
+import struct
 import time
-import json
 import logging
 from pathlib import Path
 from typing import Optional, AsyncGenerator
 from datetime import datetime
+from functools import lru_cache
 import httpx
-from pydub import AudioSegment
+import orjson
+from cachetools import TTLCache
 
 from models.schemas import (
     ContentChunk,
@@ -27,17 +32,171 @@ from models.schemas import (
     GenerationSummary,
 )
 from config import get_settings
+from services.rate_limiter import RateLimiter
+from services.audio_cache import AudioCache
 
 # Get logger
 logger = logging.getLogger('tts_backend.tts_service')
 
+# Longest wait between retries of a rate-limited chunk, in seconds
+_RETRY_MAX_DELAY = 30.0
+
+# ffmpeg raw PCM formats by sample width in bytes (pydub keeps 8-bit samples signed)
+_PCM_FORMATS = {1: "s8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
+
+async def _encode_mp3(parts: list, audio_format: tuple[int, int, int], output_path: Path) -> None:
+    """
+    Encode raw PCM to MP3 by piping it straight into ffmpeg.
+
+    pydub's MP3 export writes the audio to a temporary WAV file for ffmpeg
+    to read back; feeding stdin skips that round trip through the disk.
+    The parts are written one at a time, so ffmpeg encodes while the rest
+    are still being sent and the whole track is never joined in memory.
+
+    Args:
+        parts: Consecutive pieces of raw interleaved samples (bytes-like)
+        audio_format: (frame_rate, sample_width, channels) of the samples
+        output_path: MP3 file to write (overwritten if it exists)
+    """
+    from pydub.utils import get_encoder_name
+
+    frame_rate, sample_width, channels = audio_format
+    process = await asyncio.create_subprocess_exec(
+        get_encoder_name(), "-y", "-loglevel", "error",
+        "-f", _PCM_FORMATS[sample_width], "-ar", str(frame_rate), "-ac", str(channels),
+        "-i", "pipe:0",
+        "-f", "mp3", "-b:a", "192k", str(output_path),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    # Read stderr alongside so a chatty ffmpeg cannot stall on a full pipe
+    stderr_task = asyncio.create_task(process.stderr.read())
+    try:
+        for part in parts:
+            process.stdin.write(part)
+            await process.stdin.drain()
+        process.stdin.close()
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # ffmpeg exited early; its exit code and stderr explain why
+    except BaseException:
+        # Cancelled or failed mid-write: stop ffmpeg and reap it and its
+        # stderr reader rather than leave them behind
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        await process.wait()
+        await stderr_task
+        raise
+    stderr = await stderr_task
+    await process.wait()
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"MP3 encoding failed (ffmpeg exit {process.returncode}): "
+            f"{stderr.decode(errors='replace').strip()}"
+        )
+
+
+def _write_wav(parts: list, audio_format: tuple[int, int, int], output_path: Path) -> None:
+    """
+    Write raw PCM to a WAV file part by part, so the track is never joined in memory.
+
+    Args:
+        parts: Consecutive pieces of raw interleaved samples (bytes-like)
+        audio_format: (frame_rate, sample_width, channels) of the samples
+        output_path: WAV file to write (overwritten if it exists)
+    """
+    frame_rate, sample_width, channels = audio_format
+    if sample_width == 1:
+        from pydub.utils import audioop
+
+    with wave.open(str(output_path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(frame_rate)
+        for part in parts:
+            # WAV stores 8-bit samples unsigned, as pydub's export does
+            wav.writeframesraw(audioop.bias(part, 1, 128) if sample_width == 1 else part)
+
+
+@lru_cache(maxsize=32)
+def _silence(duration_ms: int, audio_format: tuple[int, int, int]) -> bytes:
+    """
+    Get `duration_ms` of silent PCM in `audio_format` (frame_rate, sample_width, channels).
+
+    Pauses only take a few distinct lengths, so each buffer is built once
+    and shared by every export.
+    """
+    frame_rate, sample_width, channels = audio_format
+    return bytes(int(frame_rate * duration_ms / 1000) * sample_width * channels)
+
+
+def _wav_pcm(audio: bytes) -> Optional[tuple[memoryview, tuple[int, int, int]]]:
+    """
+    Locate the samples of an uncompressed 16- or 32-bit PCM WAV without copying them.
+
+    Returns:
+        (samples, (frame_rate, sample_width, channels)), or None for any
+        other audio, which pydub has to decode (it normalizes 8- and 24-bit)
+    """
+    if audio[:4] != b"RIFF" or audio[8:12] != b"WAVE":
+        return None
+
+    audio_format = None
+    offset = 12
+    while offset + 8 <= len(audio):
+        chunk_id = audio[offset:offset + 4]
+        (size,) = struct.unpack_from("<I", audio, offset + 4)
+        start = offset + 8
+        if chunk_id == b"fmt " and size >= 16:
+            tag, channels, frame_rate, _, _, bits = struct.unpack_from("<HHIIHH", audio, start)
+            if tag != 1 or bits not in (16, 32) or not channels:
+                return None
+            audio_format = (frame_rate, bits // 8, channels)
+        elif chunk_id == b"data":
+            if audio_format is None:
+                return None
+            # Streamed WAVs may not fill in the data size; trim to whole frames
+            frame_width = audio_format[1] * audio_format[2]
+            length = min(size, len(audio) - start) if size else len(audio) - start
+            return memoryview(audio)[start:start + length - length % frame_width], audio_format
+        offset = start + size + (size & 1)
+
+    return None
+
+
+def _audio_duration_ms(audio: bytes) -> int:
+    """
+    Get the playing time of chunk audio.
+
+    PCM WAVs are timed from their header; anything else falls back to a
+    rough estimate assuming 48 kHz 16-bit mono (~96 KB/s).
+    """
+    wav = _wav_pcm(audio)
+    if wav is None or not wav[1][0]:
+        return int(len(audio) / 96)
+    samples, (frame_rate, sample_width, channels) = wav
+    return round(len(samples) * 1000 / (frame_rate * sample_width * channels))
+
+
+class _AudioJobCache(TTLCache):
+    """TTLCache of job audio that logs when a full cache evicts a job."""
+
+    def popitem(self):
+        job_id, segments = super().popitem()
+        logger.info(
+            "Evicted audio of job %s (%s chunks) to stay within %s jobs; raise JOB_CACHE_MAX_SIZE to keep more",
+            job_id, len(segments), self.maxsize
+        )
+        return job_id, segments
+
 
 class TTSService:
     """
     Service for text-to-speech conversion using Sarvam AI.
 
     Features:
-    - Async chunk processing
+    - Concurrent chunk processing with RPM/character rate limiting
     - Audio concatenation with pauses
     - Loudness adjustment for headings
     - MP3 export
@@ -48,18 +207,60 @@ class TTSService:
         self.settings = get_settings()
         self.api_key = self.settings.sarvam_api_key
         self.base_url = self.settings.sarvam_base_url
-
-        # In-memory storage for generated audio (job_id -> audio segments)
-        self._audio_cache: dict[str, list[tuple[int, bytes]]] = {}
-        self._job_status: dict[str, GenerateTTSResponse] = {}
+        self._tts_url = f"{self.base_url}/text-to-speech"
+
+        # Per-job state is bounded like the job store, so jobs nobody cleans
+        # up are dropped instead of holding their audio forever
+        max_jobs = self.settings.job_cache_max_size
+        job_ttl = self.settings.job_cache_ttl_seconds
+        # In-memory storage for generated audio (job_id -> chunk_id -> audio)
+        self._audio_cache: TTLCache[str, dict[int, Optional[bytes]]] = _AudioJobCache(maxsize=max_jobs, ttl=job_ttl)
+        self._job_status: TTLCache[str, GenerateTTSResponse] = TTLCache(maxsize=max_jobs, ttl=job_ttl)
         # API call stats storage (job_id -> list of call stats)
-        self._api_stats: dict[str, list[APICallStats]] = {}
+        self._api_stats: TTLCache[str, list[APICallStats]] = TTLCache(maxsize=max_jobs, ttl=job_ttl)
+        # Summaries of completed jobs (job_id -> summary), built once on first request
+        self._summaries: TTLCache[str, GenerationSummary] = TTLCache(maxsize=max_jobs, ttl=job_ttl)
+        # Audio cache key of each generated chunk (job_id -> chunk_id -> key)
+        self._chunk_keys: TTLCache[str, dict[int, str]] = TTLCache(maxsize=max_jobs, ttl=job_ttl)
+
+        # Shared across jobs since Sarvam quotas apply per API key
+        self._rate_limiter = RateLimiter(
+            requests_per_minute=self.settings.tts_rpm,
+            characters_per_minute=self.settings.tts_tpm,
+        )
+        # Content-addressed audio of previously synthesized chunks, shared across jobs
+        self._chunk_cache = AudioCache(
+            max_bytes=self.settings.audio_cache_max_mb * 1024 * 1024,
+            directory=self.settings.speech_output_dir / "cache" if self.settings.audio_cache_persist else None,
+            max_disk_bytes=self.settings.audio_cache_disk_max_mb * 1024 * 1024,
+        )
+        # Connection pool shared by all jobs; created on first use so it
+        # belongs to the serving event loop
+        self._client: Optional[httpx.AsyncClient] = None
 
     @property
     def is_configured(self) -> bool:
         """Check if the API is configured."""
         return bool(self.api_key and self.api_key != "your-api-key-here")
 
+    def _http_client(self) -> httpx.AsyncClient:
+        """Get the shared Sarvam AI client, so TLS connections outlive a single job."""
+        if self._client is None or self._client.is_closed:
+            # Keep one connection alive per concurrent call; concurrent jobs
+            # may open more rather than queue on the pool
+            keepalive = max(1, self.settings.tts_concurrency)
+            self._client = httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=keepalive),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def generate_tts_for_document(
         self,
         document: ParsedDocument,
@@ -78,13 +279,13 @@ class TTSService:
             GenerateTTSResponse with progress updates
         """
         job_id = str(uuid.uuid4())
-        logger.info(f"Starting TTS job {job_id} for {document.filename}")
+        logger.info("Starting TTS job %s for %s", job_id, document.filename)
 
         # Filter chunks if specific IDs requested
         chunks = document.chunks
         if chunk_ids:
             chunks = [c for c in chunks if c.id in chunk_ids]
-            logger.info(f"Processing {len(chunks)} specific chunks")
+            logger.info("Processing %s specific chunks", len(chunks))
 
         # Initialize job status
         response = GenerateTTSResponse(
@@ -95,46 +296,112 @@ class TTSService:
             status="processing",
             results=[]
         )
+        # Filled through local references, so a job evicted while it runs
+        # cannot break the loop below
         self._job_status[job_id] = response
-        self._audio_cache[job_id] = []
-        self._api_stats[job_id] = []  # Initialize stats tracking
+        # One slot per chunk in document order, so export walks them without
+        # sorting; chunks that fail stay None
+        audio_segments = self._audio_cache[job_id] = dict.fromkeys(chunk.id for chunk in chunks)
+        chunk_keys = self._chunk_keys[job_id] = {}
+        api_stats = self._api_stats[job_id] = []  # Initialize stats tracking
 
-        logger.info(f"Job {job_id}: Processing {len(chunks)} chunks")
+        logger.info("Job %s: Processing %s chunks", job_id, len(chunks))
         yield response
 
-        # Process chunks with rate limiting
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            for i, chunk in enumerate(chunks):
-                chunk_start = time.time()
-                try:
-                    logger.debug(f"Job {job_id}: Processing chunk {i+1}/{len(chunks)} (ID: {chunk.id}, {len(chunk.text)} chars)")
-                    result, stats = await self._process_chunk_with_stats(client, chunk, settings)
-                    response.results.append(result)
-                    self._api_stats[job_id].append(stats)
-
-                    if result.success and result.audio_base64:
-                        audio_bytes = base64.b64decode(result.audio_base64)
-                        self._audio_cache[job_id].append((chunk.id, audio_bytes))
-                        logger.info(f"Job {job_id}: Chunk {i+1}/{len(chunks)} completed in {stats.duration_ms}ms")
+        # Process chunks concurrently, bounded by the semaphore and rate limiter;
+        # progress is reported in completion order
+        concurrency = max(1, self.settings.tts_concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        client = self._http_client()
+        headers = {
+            "api-subscription-key": self.api_key,
+            "Content-Type": "application/json"
+        }
+        # Each chunk's audio cache key, hashed once for the lookup and the store
+        cache_keys = {
+            chunk.id: AudioCache.key_for(self._build_payload(chunk, settings))
+            for chunk in chunks
+        }
+        tasks = [
+            asyncio.create_task(self._run_chunk(client, headers, semaphore, chunk, settings, cache_keys[chunk.id]))
+            for chunk in chunks
+        ]
+        try:
+            for completed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                chunk, result, stats = await next_done
+                response.results.append(result)
+                if stats is not None:
+                    api_stats.append(stats)
+
+                if result.success and result.audio_bytes:
+                    audio_bytes = result.audio_bytes
+                    audio_segments[chunk.id] = audio_bytes
+                    cache_key = cache_keys[chunk.id]
+                    chunk_keys[chunk.id] = cache_key
+                    if stats is None:
+                        logger.info("Job %s: Chunk %s/%s (ID: %s) served from cache", job_id, completed, len(chunks), chunk.id)
                     else:
-                        logger.warning(f"Job {job_id}: Chunk {i+1} failed - {result.error}")
+                        await self._chunk_cache.put(cache_key, audio_bytes)
+                        logger.info("Job %s: Chunk %s/%s (ID: %s) completed in %sms", job_id, completed, len(chunks), chunk.id, stats.duration_ms)
+                else:
+                    logger.warning("Job %s: Chunk ID %s failed - %s", job_id, chunk.id, result.error)
+
+                response.completed_chunks += 1
+                yield response
+        finally:
+            # Stop outstanding API calls if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+
+        # Mark as completed
+        response.status = "completed"
+        self._job_status[job_id] = response
+        successful = sum(1 for r in response.results if r.success)
+        failed = len(response.results) - successful
+        logger.info("Job %s completed: %s successful, %s failed", job_id, successful, failed)
+        yield response
 
-                    response.completed_chunks += 1
-                    yield response
+    async def _run_chunk(
+        self,
+        client: httpx.AsyncClient,
+        headers: dict,
+        semaphore: asyncio.Semaphore,
+        chunk: ContentChunk,
+        settings: TTSSettings,
+        cache_key: str
+    ) -> tuple[ContentChunk, TTSChunkResult, Optional[APICallStats]]:
+        """
+        Process a chunk under the concurrency and rate limits, never raising.
 
-                    # Small delay between API calls to avoid rate limiting
-                    if i < len(chunks) - 1:
-                        await asyncio.sleep(0.2)
+        Chunks already in the audio cache under `cache_key` skip the API;
+        their stats are None.
+        """
+        cached = await self._chunk_cache.get(cache_key)
+        if cached is not None:
+            return chunk, TTSChunkResult(
+                chunk_id=chunk.id,
+                success=True,
+                audio_bytes=cached,
+                duration_ms=_audio_duration_ms(cached)
+            ), None
 
-                except Exception as e:
-                    logger.error(f"Job {job_id}: Chunk {i+1} exception - {str(e)}")
-                    response.results.append(TTSChunkResult(
+        async with semaphore:
+            try:
+                await self._rate_limiter.acquire(len(chunk.text))
+                logger.debug("Processing chunk ID %s (%s chars)", chunk.id, len(chunk.text))
+                result, stats = await self._process_chunk_with_stats(client, headers, chunk, settings)
+                return chunk, result, stats
+            except Exception as e:
+                logger.error("Chunk ID %s exception - %s", chunk.id, e)
+                return (
+                    chunk,
+                    TTSChunkResult(
                         chunk_id=chunk.id,
                         success=False,
                         error=str(e)
-                    ))
-                    # Track failed call stats
-                    self._api_stats[job_id].append(APICallStats(
+                    ),
+                    APICallStats(
                         chunk_id=chunk.id,
                         characters_sent=len(chunk.text),
                         bytes_sent=0,
@@ -142,27 +409,86 @@ class TTSService:
                         duration_ms=0,
                         success=False,
                         error=str(e)
-                    ))
-                    response.completed_chunks += 1
-                    yield response
+                    )
+                )
 
-        # Mark as completed
-        response.status = "completed"
-        self._job_status[job_id] = response
-        successful = sum(1 for r in response.results if r.success)
-        failed = len(response.results) - successful
-        logger.info(f"Job {job_id} completed: {successful} successful, {failed} failed")
-        yield response
+    @staticmethod
+    def _build_payload(chunk: ContentChunk, settings: TTSSettings) -> dict:
+        """Build the Sarvam AI text-to-speech request body for a chunk."""
+        # Adjust pace for headings (slightly slower for emphasis)
+        pace = settings.pace
+        # Handle both enum and string type values (due to serialization)
+        chunk_type = chunk.type.value if hasattr(chunk.type, 'value') else chunk.type
+        if chunk_type.startswith('h'):
+            pace = max(0.9, settings.pace - 0.1)  # Slightly slower for headings
+
+        return {
+            "text": chunk.text,
+            "target_language_code": settings.target_language_code,
+            "speaker": settings.speaker,
+            "pace": pace,
+            "speech_sample_rate": settings.speech_sample_rate,
+            "enable_preprocessing": settings.enable_preprocessing,
+            "model": settings.model,
+        }
+
+    async def _post_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        body: bytes,
+        headers: dict,
+        characters: int
+    ) -> httpx.Response:
+        """
+        POST a TTS request, backing off and retrying while Sarvam AI answers 429.
+
+        `body` is the already serialized JSON payload, sent as is on every attempt.
+
+        Returns:
+            The last response (still 429 once retries are exhausted)
+        """
+        max_retries = max(0, self.settings.tts_max_retries)
+        for attempt in range(max_retries + 1):
+            response = await client.post(
+                self._tts_url,
+                content=body,
+                headers=headers
+            )
+            if response.status_code != 429 or attempt == max_retries:
+                return response
+
+            delay = self._retry_delay(attempt, response.headers.get("retry-after"))
+            logger.warning("Rate limited by Sarvam AI, retrying in %.2fs (%s/%s)", delay, attempt + 1, max_retries)
+            # The quota is shared, so hold back the other chunks too rather
+            # than let each of them run into its own 429
+            self._rate_limiter.hold(delay)
+            await asyncio.sleep(delay)
+            # A retry is another request against the same quota
+            await self._rate_limiter.acquire(characters)
+
+        return response
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before retry `attempt`, preferring the server's Retry-After."""
+        if retry_after:
+            try:
+                return min(_RETRY_MAX_DELAY, max(0.0, float(retry_after)))
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+        base = self.settings.tts_retry_base_seconds
+        # Full jitter keeps concurrent chunks from retrying in lockstep
+        return min(_RETRY_MAX_DELAY, base * 2 ** attempt) + random.uniform(0, base)
 
     async def _process_chunk_with_stats(
         self,
         client: httpx.AsyncClient,
+        headers: dict,
         chunk: ContentChunk,
         settings: TTSSettings
     ) -> tuple[TTSChunkResult, APICallStats]:
-        """Process a single chunk through the TTS API and track stats."""
+        """Process a single chunk through the TTS API and track stats, sending the job's `headers`."""
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         if not self.is_configured:
             return (
@@ -182,47 +508,23 @@ class TTSService:
                 )
             )
 
-        # Prepare the request
-        # Adjust pace for headings (slightly slower for emphasis)
-        pace = settings.pace
-        # Handle both enum and string type values (due to serialization)
-        chunk_type = chunk.type.value if hasattr(chunk.type, 'value') else chunk.type
-        if chunk_type.startswith('h'):
-            pace = max(0.9, settings.pace - 0.1)  # Slightly slower for headings
-
-        payload = {
-            "text": chunk.text,
-            "target_language_code": settings.target_language_code,
-            "speaker": settings.speaker,
-            "pace": pace,
-            "speech_sample_rate": settings.speech_sample_rate,
-            "enable_preprocessing": settings.enable_preprocessing,
-            "model": settings.model,
-        }
-
-        payload_bytes = json.dumps(payload).encode('utf-8')
+        payload = self._build_payload(chunk, settings)
+        # Serialized once: the same bytes are measured and sent (and re-sent on retries)
+        payload_bytes = orjson.dumps(payload)
         bytes_sent = len(payload_bytes)
 
-        headers = {
-            "api-subscription-key": self.api_key,
-            "Content-Type": "application/json"
-        }
-
         try:
-            response = await client.post(
-                f"{self.base_url}/text-to-speech",
-                json=payload,
-                headers=headers
-            )
+            response = await self._post_with_retry(client, payload_bytes, headers, len(chunk.text))
             response.raise_for_status()
 
             response_bytes = len(response.content)
-            duration_ms = int((time.time() - start_time) * 1000)
-
-            data = response.json()
+            duration_ms = int((time.perf_counter() - start_time) * 1000)
 
-            # Extract audio from response
+            data = orjson.loads(response.content)
+            # Extract audio from response, then let the raw body and the
+            # parsed payload go so fewer copies of the audio are alive at once
             audio_base64 = data.get("audios", [None])[0]
+            del response, data
 
             if not audio_base64:
                 return (
@@ -242,17 +544,17 @@ class TTSService:
                     )
                 )
 
-            # Estimate duration (rough calculation)
-            # Base64 WAV at 48kHz, 16-bit mono is ~96KB/s
-            audio_bytes = base64.b64decode(audio_base64)
-            estimated_duration_ms = len(audio_bytes) / 96  # Very rough estimate
+            # Decoded once here; the audio travels as bytes from now on.
+            # binascii reads the ASCII str in place, where base64.b64decode
+            # would first copy it into bytes
+            audio_bytes = binascii.a2b_base64(audio_base64)
 
             return (
                 TTSChunkResult(
                     chunk_id=chunk.id,
                     success=True,
-                    audio_base64=audio_base64,
-                    duration_ms=int(estimated_duration_ms)
+                    audio_bytes=audio_bytes,
+                    duration_ms=_audio_duration_ms(audio_bytes)
                 ),
                 APICallStats(
                     chunk_id=chunk.id,
@@ -265,7 +567,7 @@ class TTSService:
             )
 
         except httpx.HTTPStatusError as e:
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = int((time.perf_counter() - start_time) * 1000)
             error_msg = f"API error: {e.response.status_code} - {e.response.text}"
             return (
                 TTSChunkResult(
@@ -284,7 +586,7 @@ class TTSService:
                 )
             )
         except Exception as e:
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = int((time.perf_counter() - start_time) * 1000)
             return (
                 TTSChunkResult(
                     chunk_id=chunk.id,
@@ -302,89 +604,6 @@ class TTSService:
                 )
             )
 
-    async def _process_chunk(
-        self,
-        client: httpx.AsyncClient,
-        chunk: ContentChunk,
-        settings: TTSSettings
-    ) -> TTSChunkResult:
-        """Process a single chunk through the TTS API."""
-
-        if not self.is_configured:
-            return TTSChunkResult(
-                chunk_id=chunk.id,
-                success=False,
-                error="Sarvam AI API key not configured"
-            )
-
-        # Prepare the request
-        # Adjust pace for headings (slightly slower for emphasis)
-        pace = settings.pace
-        # Handle both enum and string type values (due to serialization)
-        chunk_type = chunk.type.value if hasattr(chunk.type, 'value') else chunk.type
-        if chunk_type.startswith('h'):
-            pace = max(0.9, settings.pace - 0.1)  # Slightly slower for headings
-
-        payload = {
-            "text": chunk.text,
-            "target_language_code": settings.target_language_code,
-            "speaker": settings.speaker,
-            "pace": pace,
-            "speech_sample_rate": settings.speech_sample_rate,
-            "enable_preprocessing": settings.enable_preprocessing,
-            "model": settings.model,
-        }
-
-        headers = {
-            "api-subscription-key": self.api_key,
-            "Content-Type": "application/json"
-        }
-
-        try:
-            response = await client.post(
-                f"{self.base_url}/text-to-speech",
-                json=payload,
-                headers=headers
-            )
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Extract audio from response
-            audio_base64 = data.get("audios", [None])[0]
-
-            if not audio_base64:
-                return TTSChunkResult(
-                    chunk_id=chunk.id,
-                    success=False,
-                    error="No audio in response"
-                )
-
-            # Estimate duration (rough calculation)
-            # Base64 WAV at 48kHz, 16-bit mono is ~96KB/s
-            audio_bytes = base64.b64decode(audio_base64)
-            estimated_duration_ms = len(audio_bytes) / 96  # Very rough estimate
-
-            return TTSChunkResult(
-                chunk_id=chunk.id,
-                success=True,
-                audio_base64=audio_base64,
-                duration_ms=int(estimated_duration_ms)
-            )
-
-        except httpx.HTTPStatusError as e:
-            return TTSChunkResult(
-                chunk_id=chunk.id,
-                success=False,
-                error=f"API error: {e.response.status_code} - {e.response.text}"
-            )
-        except Exception as e:
-            return TTSChunkResult(
-                chunk_id=chunk.id,
-                success=False,
-                error=str(e)
-            )
-
     async def export_audio(
         self,
         job_id: str,
@@ -404,47 +623,84 @@ class TTSService:
         Returns:
             Tuple of (output_path, file_size_bytes, duration_seconds)
         """
-        if job_id not in self._audio_cache:
-            raise ValueError(f"Job not found: {job_id}")
+        # pydub is only needed here; importing it on first export keeps it
+        # (and its ffmpeg probing) out of startup for servers that never export
+        from pydub import AudioSegment
+        from pydub.utils import audioop, db_to_float
 
-        audio_segments = self._audio_cache[job_id]
-        if not audio_segments:
-            raise ValueError("No audio segments to export")
+        audio_segments = self._audio_cache.get(job_id)
+        if audio_segments is None:
+            audio_segments = await self._load_cached_audio(job_id, document)
 
         # Create chunk lookup for pause information
         chunk_lookup = {c.id: c for c in document.chunks}
 
-        # Concatenate audio with pauses
-        combined = AudioSegment.empty()
-
-        for chunk_id, audio_bytes in sorted(audio_segments, key=lambda x: x[0]):
-            # Load audio segment
-            try:
-                segment = AudioSegment.from_wav(io.BytesIO(audio_bytes))
-            except Exception:
-                # Try as raw audio
-                segment = AudioSegment.from_file(io.BytesIO(audio_bytes))
+        # Collect raw PCM for every chunk and pause, then stream it into the
+        # encoder; adding AudioSegments together copies the whole result each time
+        parts: list = []  # bytes-like: chunk samples may be views into the cached WAVs
+        audio_format: Optional[tuple[int, int, int]] = None  # (frame_rate, sample_width, channels)
+
+        for chunk_id, audio_bytes in audio_segments.items():
+            if audio_bytes is None:
+                continue
+
+            # Sarvam AI returns plain PCM WAV, whose samples can be used in
+            # place; anything else is decoded by pydub
+            wav = _wav_pcm(audio_bytes)
+            if wav is not None:
+                raw_data, chunk_format = wav
+                segment = None
+            else:
+                try:
+                    segment = AudioSegment.from_wav(io.BytesIO(audio_bytes))
+                except Exception:
+                    # Try as raw audio
+                    segment = AudioSegment.from_file(io.BytesIO(audio_bytes))
+                raw_data = segment.raw_data
+                chunk_format = (segment.frame_rate, segment.sample_width, segment.channels)
+
+            # The first chunk decides the format; a job's chunks share one
+            # sample rate, but convert any that differ rather than garble them
+            if audio_format is None:
+                audio_format = chunk_format
+            elif chunk_format != audio_format:
+                if segment is None:
+                    segment = AudioSegment(
+                        data=bytes(raw_data),
+                        frame_rate=chunk_format[0],
+                        sample_width=chunk_format[1],
+                        channels=chunk_format[2]
+                    )
+                frame_rate, sample_width, channels = audio_format
+                segment = segment.set_frame_rate(frame_rate).set_sample_width(sample_width).set_channels(channels)
+                raw_data = segment.raw_data
 
-            # Apply loudness boost if needed
+            # Apply loudness boost if needed, scaling the raw samples directly
+            # (audioop clips like pydub's gain does) instead of spawning a
+            # second AudioSegment
             chunk = chunk_lookup.get(chunk_id)
             if chunk and chunk.loudness_boost > 1.0:
                 # Convert boost to dB (1.3 boost ≈ +2.3dB)
                 db_boost = 20 * (chunk.loudness_boost - 1.0)
-                segment = segment + db_boost
+                raw_data = audioop.mul(raw_data, audio_format[1], db_to_float(db_boost))
 
             # Add segment
-            combined += segment
+            parts.append(raw_data)
 
             # Add pause after chunk
             if chunk:
                 pause_duration = chunk.pause_after_ms
                 if pause_duration > 0:
-                    silence = AudioSegment.silent(duration=pause_duration)
-                    combined += silence
+                    parts.append(_silence(pause_duration, audio_format))
+
+        if audio_format is None:
+            raise ValueError("No audio segments to export")
+
+        frame_rate, sample_width, channels = audio_format
+        pcm_bytes = sum(len(part) for part in parts)
 
         # Ensure output directory exists
-        settings = get_settings()
-        output_dir = settings.speech_output_dir
+        output_dir = self.settings.speech_output_dir
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Generate filename
@@ -457,13 +713,13 @@ class TTSService:
 
         # Export
         if format == "mp3":
-            combined.export(output_path, format="mp3", bitrate="192k")
+            await _encode_mp3(parts, audio_format, output_path)
         else:
-            combined.export(output_path, format="wav")
+            await asyncio.to_thread(_write_wav, parts, audio_format, output_path)
 
         # Get file info
         file_size = output_path.stat().st_size
-        duration_seconds = len(combined) / 1000.0
+        duration_seconds = pcm_bytes / (frame_rate * sample_width * channels)
 
         return output_path, file_size, duration_seconds
 
@@ -471,49 +727,105 @@ class TTSService:
         """Get the status of a TTS generation job."""
         return self._job_status.get(job_id)
 
+    def get_persistent_state(self, job_id: str) -> dict:
+        """
+        Get the job state worth keeping across restarts.
+
+        Returns:
+            `{"chunk_keys", "api_stats"}`, the live objects generation fills
+        """
+        return {
+            "chunk_keys": self._chunk_keys.get(job_id, {}),
+            "api_stats": self._api_stats.get(job_id, []),
+        }
+
+    def restore_job(
+        self,
+        response: GenerateTTSResponse,
+        chunk_keys: dict[int, str],
+        api_stats: list[APICallStats]
+    ) -> None:
+        """
+        Re-register a job loaded from a snapshot.
+
+        Its chunk audio is not restored; export reloads it from the audio
+        cache through `chunk_keys`.
+        """
+        self._job_status.setdefault(response.job_id, response)
+        self._chunk_keys.setdefault(response.job_id, chunk_keys)
+        self._api_stats.setdefault(response.job_id, api_stats)
+
+    async def _load_cached_audio(self, job_id: str, document: ParsedDocument) -> dict[int, Optional[bytes]]:
+        """
+        Rebuild a restored job's chunk audio from the audio cache, in document order.
+
+        Raises:
+            ValueError: If the job is unknown or any of its audio is no longer cached
+        """
+        chunk_keys = self._chunk_keys.get(job_id)
+        if chunk_keys is None:
+            raise ValueError(f"Job not found: {job_id}")
+
+        chunk_ids = [chunk.id for chunk in document.chunks if chunk.id in chunk_keys]
+        audio = await asyncio.gather(*(self._chunk_cache.get(chunk_keys[chunk_id]) for chunk_id in chunk_ids))
+        if not chunk_ids or any(a is None for a in audio):
+            raise ValueError(f"Audio of restored job {job_id} is no longer cached; regenerate it")
+
+        audio_segments = self._audio_cache[job_id] = dict(zip(chunk_ids, audio))
+        return audio_segments
+
     def get_audio_preview(self, job_id: str, chunk_id: int) -> Optional[bytes]:
         """Get audio for a specific chunk."""
-        if job_id not in self._audio_cache:
-            return None
-
-        for cid, audio in self._audio_cache[job_id]:
-            if cid == chunk_id:
-                return audio
+        return self._audio_cache.get(job_id, {}).get(chunk_id)
 
-        return None
+    def get_audio_preview_path(self, job_id: str, chunk_id: int) -> Optional[Path]:
+        """Get the on-disk audio cache file for a chunk, if it was persisted."""
+        cache_key = self._chunk_keys.get(job_id, {}).get(chunk_id)
+        if cache_key is None:
+            return None
+        return self._chunk_cache.file_for(cache_key)
 
     def cleanup_job(self, job_id: str):
         """Clean up resources for a job."""
         self._audio_cache.pop(job_id, None)
         self._job_status.pop(job_id, None)
         self._api_stats.pop(job_id, None)
+        self._summaries.pop(job_id, None)
+        self._chunk_keys.pop(job_id, None)
 
     def get_generation_summary(self, job_id: str) -> Optional[GenerationSummary]:
         """Get summary statistics for a generation job."""
-        if job_id not in self._api_stats:
+        # Stats of a completed job no longer change, so its summary is reusable
+        cached = self._summaries.get(job_id)
+        if cached is not None:
+            return cached
+
+        stats = self._api_stats.get(job_id)
+        if stats is None:
             return None
 
-        stats = self._api_stats[job_id]
         job_status = self._job_status.get(job_id)
 
-        if not stats or not job_status:
+        if not job_status:
             return None
 
-        successful = [s for s in stats if s.success]
-        failed = [s for s in stats if not s.success]
-
-        total_chars = sum(s.characters_sent for s in stats)
-        total_sent = sum(s.bytes_sent for s in stats)
-        total_received = sum(s.bytes_received for s in stats)
-        total_duration = sum(s.duration_ms for s in stats)
+        # One pass over the calls for every total
+        successful = total_chars = total_sent = total_received = total_duration = 0
+        for s in stats:
+            successful += s.success
+            total_chars += s.characters_sent
+            total_sent += s.bytes_sent
+            total_received += s.bytes_received
+            total_duration += s.duration_ms
         avg_response = total_duration / len(stats) if stats else 0
 
-        return GenerationSummary(
+        summary = GenerationSummary(
             job_id=job_id,
             filename=job_status.filename,
             total_api_calls=len(stats),
-            successful_calls=len(successful),
-            failed_calls=len(failed),
+            cached_chunks=len(job_status.results) - len(stats),
+            successful_calls=successful,
+            failed_calls=len(stats) - successful,
             total_characters=total_chars,
             total_bytes_sent=total_sent,
             total_bytes_received=total_received,
@@ -522,6 +834,11 @@ class TTSService:
             calls=stats
         )
 
+        if job_status.status == "completed":
+            self._summaries[job_id] = summary
+
+        return summary
+
 
 # Singleton instance
 _tts_service: Optional[TTSService] = None
@@ -63,6 +63,7 @@ def test_tts_generate(parsed_doc):
     # Generate TTS using file-based approach
     resp = client.post(
         f"{BASE_URL}/api/tts/generate",
+        params={"include_audio": True},
         json={
             "file_path": "hi/artilce-1.md",
             "settings": {
@@ -0,0 +1,100 @@
+"""
+Shared fixtures for the TTS backend tests.
+"""
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import get_settings
+from main import app
+from services.audio_cache import AudioCache
+from services.rate_limiter import RateLimiter
+from services.file_discovery import FileDiscoveryService
+from services.tts_service import get_tts_service
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _quiet_logs():
+    """Silence the app's request and chunk logging for the whole run."""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+# Canned translate directory: small, fixed documents instead of the real
+# pipeline output, so listings and parses are the same on every checkout
+_ARTICLES = {
+    "eng/article.md": "# English Article\n\n" + "\n\n".join(
+        f"Paragraph {i} says something about speech synthesis for the reader." for i in range(20)
+    ),
+    "hi/test-simple.md": (
+        "# परीक्षण दस्तावेज़\n\n"
+        "यह एक छोटा परीक्षण दस्तावेज़ है।\n\n"
+        "## पहला भाग\n\n"
+        "यह पहला भाग का सामग्री है। यह छोटा है लेकिन TTS परीक्षण के लिए पर्याप्त है।\n\n"
+        "- पहला बिंदु\n"
+        "- दूसरा बिंदु\n"
+    ),
+}
+
+
+@pytest.fixture(scope="session")
+def articles_dir(tmp_path_factory):
+    """Translate directory holding `_ARTICLES`, set as the configured one for the session."""
+    path = tmp_path_factory.mktemp("translate").resolve()
+    for name, content in _ARTICLES.items():
+        (path / name).parent.mkdir(exist_ok=True)
+        (path / name).write_text(content, encoding="utf-8")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(get_settings().__dict__, "translate_dir", path)
+        yield path
+
+
+@pytest.fixture(scope="session")
+def client(articles_dir):
+    """Test client for the whole session; the app's lifespan runs once around it."""
+    with pytest.MonkeyPatch.context() as mp:
+        # Keep the startup restore and shutdown snapshot away from the real
+        # speech output directory
+        mp.setattr(app.state.settings, "job_snapshot_interval_seconds", 0)
+        mp.setattr(app.state, "file_service", FileDiscoveryService(articles_dir))
+        with TestClient(app) as test_client:
+            yield test_client
+
+
+@pytest.fixture(scope="session")
+def all_files(client):
+    """The `/api/files` listing, fetched once per session."""
+    return client.get("/api/files").json()
+
+
+@pytest.fixture(scope="session")
+def first_language_files(all_files):
+    """Documents of the first language that has any (empty if none do)."""
+    return next((group["files"] for group in all_files if group["files"]), [])
+
+
+@pytest.fixture(scope="session")
+def first_file(first_language_files):
+    """The first discovered document; skips every test using it when there are none."""
+    if not first_language_files:
+        pytest.skip("No documents in the translate directory")
+    return first_language_files[0]
+
+
+@pytest.fixture
+def offline_tts(monkeypatch):
+    """
+    The shared TTS service without an API key or cached audio.
+
+    Generation then fails every chunk immediately, so tests never reach
+    Sarvam AI even when a real key is configured; the rate limits are lifted
+    so those failures are not paced either.
+    """
+    tts_service = get_tts_service()
+    monkeypatch.setattr(tts_service, "api_key", "")
+    monkeypatch.setattr(tts_service, "_rate_limiter", RateLimiter())
+    monkeypatch.setattr(tts_service, "_chunk_cache", AudioCache(max_bytes=0))
+    return tts_service
@@ -0,0 +1,79 @@
+"""
+Unit Tests for File Discovery
+
+Exercises the discovery service directly, without the HTTP app.
+"""
+import pytest
+from config import get_settings
+from services.file_discovery import FileDiscoveryService
+
+
+@pytest.fixture(scope="module")
+def discovery_service(articles_dir):
+    """One file discovery service over the configured translate directory."""
+    return FileDiscoveryService()
+
+
+@pytest.fixture(scope="module")
+def discovered_languages(discovery_service):
+    """Languages and documents found in the translate directory, scanned once."""
+    return discovery_service.discover_all_languages()
+
+
+class TestFileDiscoveryService:
+    """Test file discovery service."""
+    
+    def test_service_creation(self, discovery_service):
+        """Should create service instance over the configured translate folder."""
+        assert discovery_service.translate_path == get_settings().translate_dir
+
+    def test_discover_all_languages(self, discovered_languages):
+        """Should discover each language folder with its documents and titles."""
+        assert [group.language for group in discovered_languages] == ["English", "Hindi"]
+        assert [f.title for f in discovered_languages[1].files] == ["परीक्षण दस्तावेज़"]
+    
+    def test_listing_cache_and_invalidation(self, tmp_path):
+        """Scan results should be reused until the cache is invalidated."""
+        (tmp_path / "hi").mkdir()
+        (tmp_path / "hi" / "a.md").write_text("# A", encoding="utf-8")
+        service = FileDiscoveryService(translate_path=tmp_path)
+
+        first = service.discover_all_languages()
+        assert [f.filename for f in first[0].files] == ["a.md"]
+        etag = service.get_listing_etag()
+
+        (tmp_path / "hi" / "b.md").write_text("# B", encoding="utf-8")
+        assert service.discover_all_languages() is first
+
+        service.invalidate_cache()
+        files = service.discover_all_languages()[0].files
+        assert [f.filename for f in files] == ["a.md", "b.md"]
+        assert [f.title for f in files] == ["A", "B"]
+        assert service.get_listing_etag() != etag
+
+    def test_titles_are_cached_until_file_changes(self, tmp_path, monkeypatch):
+        """Unchanged files should not be reopened on a rescan."""
+        (tmp_path / "hi").mkdir()
+        for name in ("a.md", "b.md", "c.md"):
+            (tmp_path / "hi" / name).write_text(f"# {name}", encoding="utf-8")
+        service = FileDiscoveryService(translate_path=tmp_path)
+        assert [f.title for f in service.discover_files_for_language("hi")] == ["a.md", "b.md", "c.md"]
+
+        reads = []
+        extract_title = service._extract_title
+        monkeypatch.setattr(service, "_extract_title", lambda path: reads.append(path.name) or extract_title(path))
+        (tmp_path / "hi" / "b.md").write_text("# Changed title", encoding="utf-8")
+        service.invalidate_cache()
+
+        assert [f.title for f in service.discover_files_for_language("hi")] == ["a.md", "Changed title", "c.md"]
+        assert reads == ["b.md"]
+
+    def test_extract_title(self, discovery_service, tmp_path):
+        """Should extract title from markdown file."""
+        path = tmp_path / "titled.md"
+        path.write_bytes("## Section\r\n\r\n  # शीर्षक Title  \r\nBody\r\n".encode("utf-8"))
+        assert discovery_service._extract_title(path) == "शीर्षक Title"
+
+        path.write_bytes(b"x" * 5000 + b"\n# Too Late\n")
+        assert discovery_service._extract_title(path) is None
+        assert discovery_service._extract_title(tmp_path / "missing.md") is None
@@ -3,65 +3,171 @@ End-to-End Tests for TTS Backend
 
 Tests the complete flow from file discovery to TTS generation.
 """
+import asyncio
+import base64
+import io
+import json
+import math
+import os
+import sys
+import time
+import struct
+import wave
+import httpx
+import orjson
 import pytest
 from pathlib import Path
-from fastapi.testclient import TestClient
-import sys
+from typing import Annotated
+from pydantic import Field, TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+import main
+from main import _active_jobs
+from config import get_settings
+from services.markdown_parser import create_parser
+from services.tts_service import TTSService, _audio_duration_ms, _encode_mp3, _wav_pcm, get_tts_service
+from services.rate_limiter import RateLimiter, TokenBucket
+from services.audio_cache import AudioCache
+from services.job_store import JobStore
+from models import (
+    TTSSettings, TTSChunkResult, APICallStats, GenerateTTSResponse, FileInfo, LanguageFiles
+)
+
+
+def make_wav(duration_ms: int = 200, sample_rate: int = 22050) -> bytes:
+    """Build a short mono 16-bit sine-wave WAV for audio tests."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        frames = sample_rate * duration_ms // 1000
+        wav.writeframes(b"".join(
+            struct.pack("<h", int(8000 * math.sin(i / 10))) for i in range(frames)
+        ))
+    return buffer.getvalue()
+
+
+def assert_keys(response: httpx.Response, keys: set[str]) -> dict:
+    """Parse a JSON object response with orjson and check it has at least `keys`."""
+    data = orjson.loads(response.content)
+    missing = keys - data.keys()
+    assert not missing, f"response is missing {sorted(missing)}"
+    return data
+
+
+class SpeakerEntry(TypedDict):
+    id: str
+    name: str
+    gender: str
+
+
+class LanguageEntry(TypedDict):
+    code: str
+    name: str
+
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+class SpeakerCatalogue(TypedDict):
+    speakers: Annotated[list[SpeakerEntry], Field(min_length=1)]
 
-from main import app
-from services.markdown_parser import MarkdownParser, create_parser
-from services.file_discovery import FileDiscoveryService
 
+class LanguageCatalogue(TypedDict):
+    languages: Annotated[list[LanguageEntry], Field(min_length=1)]
 
-# Create test client
-client = TestClient(app)
+
+# Response shapes, validated straight from the JSON bytes by pydantic-core
+FILE_GROUPS = TypeAdapter(list[LanguageFiles])
+FILES = TypeAdapter(list[FileInfo])
+DEFAULT_SETTINGS = TypeAdapter(TTSSettings)
+SPEAKERS = TypeAdapter(SpeakerCatalogue)
+LANGUAGES = TypeAdapter(LanguageCatalogue)
+
+
+def assert_shape(response: httpx.Response, adapter: TypeAdapter):
+    """Validate a JSON response body against `adapter`, failing the test on mismatch."""
+    try:
+        return adapter.validate_json(response.content)
+    except ValidationError as e:
+        pytest.fail(f"unexpected response shape: {e}")
+
+
+# Generation request with every setting spelled out, serialized once
+_GENERATE_BODY = orjson.dumps({
+    "file_path": "hi/test-simple.md",
+    "settings": {
+        "target_language_code": "hi-IN",
+        "speaker": "shubh",
+        "pace": 1.1,
+        "speech_sample_rate": 48000,
+        "model": "bulbul:v3",
+        "temperature": 0.6,
+        "enable_preprocessing": True,
+        "heading_loudness_boost": 1.2,
+        "pause_after_heading_ms": 500,
+        "pause_after_bullet_ms": 300
+    }
+})
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits(monkeypatch):
+    """Give every test a fresh per-client request rate limit."""
+    monkeypatch.setattr(main, "_rate_limit_buckets", {})
+
+
+@pytest.fixture
+def fake_job(tmp_path, monkeypatch):
+    """Register a job with synthetic audio; exports go to a temp directory."""
+    monkeypatch.setitem(get_settings().__dict__, "speech_output_dir", tmp_path)
+    document = create_parser().parse_content("# Title\n\nHello world.\n\n- Point", "fake.md")
+    tts_service = get_tts_service()
+    job_id = "test-job"
+    tts_service._audio_cache[job_id] = {c.id: make_wav() for c in document.chunks}
+    _active_jobs[job_id] = {"document": document}
+    yield job_id
+    tts_service.cleanup_job(job_id)
+    _active_jobs.pop(job_id, None)
 
 
 class TestHealthEndpoint:
     """Test health check endpoint."""
     
-    def test_health_returns_200(self):
-        """Health endpoint should return 200."""
+    def test_health(self, client):
+        """Health endpoint should return 200 with status and version info."""
         response = client.get("/api/health")
         assert response.status_code == 200
-        
-    def test_health_returns_version(self):
-        """Health endpoint should return version info."""
-        response = client.get("/api/health")
-        data = response.json()
-        assert "version" in data
-        assert "status" in data
+        data = assert_keys(response, {"version", "status"})
         assert data["status"] == "healthy"
 
 
 class TestFileDiscoveryEndpoints:
     """Test file discovery endpoints."""
     
-    def test_list_all_files(self):
-        """Should list files grouped by language."""
+    def test_list_all_files(self, client):
+        """Should list files grouped by language, answering 304 while the ETag matches."""
         response = client.get("/api/files")
         assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-        
-    def test_list_files_for_language(self):
+        assert_shape(response, FILE_GROUPS)
+
+        cached = client.get("/api/files", headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+
+    def test_list_files_for_language(self, client, first_file):
         """Should list files for specific language."""
-        # First get available languages
-        all_files = client.get("/api/files").json()
-        
-        if all_files:
-            # Get files for the first language
-            lang = all_files[0]["files"][0]["language"] if all_files[0]["files"] else None
-            if lang:
-                response = client.get(f"/api/files/{lang}")
-                assert response.status_code == 200
-                data = response.json()
-                assert isinstance(data, list)
+        response = client.get(f"/api/files/{first_file['language']}")
+        assert response.status_code == 200
+        assert all(f.language == first_file["language"] for f in assert_shape(response, FILES))
     
-    def test_list_files_invalid_language(self):
+    def test_file_content_conditional_get(self, client, first_file):
+        """Should return 304 when the file ETag still matches."""
+        url = f"/api/files/{first_file['language']}/{first_file['filename']}/content"
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "content" in response.json()
+        cached = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    def test_list_files_invalid_language(self, client):
         """Should return 404 for invalid language."""
         response = client.get("/api/files/nonexistent")
         assert response.status_code == 404
@@ -70,26 +176,49 @@ class TestFileDiscoveryEndpoints:
 class TestParsingEndpoints:
     """Test markdown parsing endpoints."""
     
-    def test_parse_markdown(self):
+    def test_parse_markdown(self, client, first_file):
         """Should parse markdown file into chunks."""
-        # First get available files
-        all_files = client.get("/api/files").json()
-        
-        if all_files and all_files[0]["files"]:
-            file = all_files[0]["files"][0]
-            response = client.post("/api/parse", json={
-                "language": file["language"],
-                "filename": file["filename"]
-            })
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert "chunks" in data
-            assert "total_chunks" in data
-            assert "total_characters" in data
-            assert isinstance(data["chunks"], list)
+        response = client.post("/api/parse", json={
+            "language": first_file["language"],
+            "filename": first_file["filename"]
+        })
+
+        assert response.status_code == 200
+        data = assert_keys(response, {"chunks", "total_chunks", "total_characters"})
+        assert isinstance(data["chunks"], list)
     
-    def test_parse_nonexistent_file(self):
+    def test_parse_markdown_custom_chunk_size(self, client, first_file):
+        """Should honour a per-request max_chunk_size override."""
+        response = client.post("/api/parse", json={
+            "language": first_file["language"],
+            "filename": first_file["filename"],
+            "max_chunk_size": 100
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        paragraphs = [c for c in data["chunks"] if c["type"] == "paragraph"]
+        assert all(c["char_count"] <= 100 for c in paragraphs)
+
+    def test_parse_invalid_body(self, client):
+        """Should return 422 with body locations for invalid requests."""
+        response = client.post("/api/parse", json={"language": "hi"})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "filename"]
+
+    def test_parse_response_is_compressed(self, client, first_file, first_language_files):
+        """Large parse responses should be gzip-encoded when accepted."""
+        file = max(first_language_files, key=lambda f: f["size_bytes"])
+        response = client.post(
+            "/api/parse",
+            json={"language": file["language"], "filename": file["filename"]},
+            headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+        assert_keys(response, {"chunks"})
+
+    def test_parse_nonexistent_file(self, client):
         """Should return 404 for nonexistent file."""
         response = client.post("/api/parse", json={
             "language": "hi",
@@ -101,136 +230,695 @@ class TestParsingEndpoints:
 class TestSettingsEndpoints:
     """Test settings endpoints."""
     
-    def test_get_default_settings(self):
-        """Should return default TTS settings."""
-        response = client.get("/api/settings/defaults")
+    async def test_settings_bundle(self):
+        """Should return default TTS settings and the speaker and language lists."""
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            defaults, speakers, languages = await asyncio.gather(
+                async_client.get("/api/settings/defaults"),
+                async_client.get("/api/settings/speakers"),
+                async_client.get("/api/settings/languages"),
+            )
+
+        for response in (defaults, speakers, languages):
+            assert response.status_code == 200
+        assert_keys(defaults, {"speaker", "pace", "speech_sample_rate"})
+        assert_shape(defaults, DEFAULT_SETTINGS)
+        assert_shape(speakers, SPEAKERS)
+        assert_shape(languages, LANGUAGES)
+
+    @pytest.mark.parametrize("url, cache_control", [
+        ("/api/settings/defaults", "no-cache"),
+        ("/api/settings/speakers", "max-age"),
+        ("/api/settings/languages", "max-age"),
+    ])
+    def test_settings_caching_headers(self, client, url, cache_control):
+        """Settings payloads should carry their Cache-Control and answer 304 to a matching ETag."""
+        response = client.get(url)
+        assert cache_control in response.headers["cache-control"]
+        cached = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+
+class TestUploadEndpoint:
+    """Test markdown upload endpoint."""
+
+    def test_upload_extracts_title(self, client):
+        """Should return content, size and first H1 as title."""
+        content = "Intro line\n\n# शीर्षक Title\n\nBody text.\n".encode("utf-8")
+        response = client.post(
+            "/api/files/upload",
+            files={"file": ("sample.md", content, "text/markdown")},
+            data={"language": "hi"}
+        )
         assert response.status_code == 200
         data = response.json()
-        
-        assert "speaker" in data
-        assert "pace" in data
-        assert "speech_sample_rate" in data
+        assert data["title"] == "शीर्षक Title"
+        assert data["content"] == content.decode("utf-8")
+        assert data["size_bytes"] == len(content)
+
+    def test_upload_title_ignores_subheadings(self, client):
+        """Should skip H2 headings and handle CRLF line endings."""
+        content = b"## Section\r\n\r\n  #   Real Title  \r\nText\r\n"
+        response = client.post(
+            "/api/files/upload",
+            files={"file": ("crlf.md", content, "text/markdown")}
+        )
+        data = response.json()
+        assert data["title"] == "Real Title"
+        assert data["content"] == content.decode("utf-8")
+
+    def test_upload_rejects_non_markdown(self, client):
+        """Should reject files without .md extension."""
+        response = client.post(
+            "/api/files/upload",
+            files={"file": ("sample.txt", b"hello", "text/plain")}
+        )
+        assert response.status_code == 400
+
+    def test_upload_rejects_invalid_utf8(self, client):
+        """Should reject content that is not UTF-8 instead of failing with 500."""
+        response = client.post(
+            "/api/files/upload",
+            files={"file": ("latin1.md", "# Café".encode("latin-1"), "text/markdown")}
+        )
+        assert response.status_code == 400
+
+
+class TestTTSGeneration:
+    """Test TTS generation endpoints (requires API key)."""
     
-    def test_get_speakers(self):
-        """Should return list of speakers."""
-        response = client.get("/api/settings/speakers")
+    def test_generate_without_api_key(self, client, offline_tts):
+        """Should handle missing API key gracefully."""
+        response = client.post(
+            "/api/tts/generate", content=_GENERATE_BODY, headers={"content-type": "application/json"}
+        )
+
+        # Every chunk fails with the configuration error instead of the request failing
         assert response.status_code == 200
         data = response.json()
-        
-        assert "speakers" in data
-        assert isinstance(data["speakers"], list)
-        assert len(data["speakers"]) > 0
-    
-    def test_get_languages(self):
-        """Should return list of languages."""
-        response = client.get("/api/settings/languages")
+        assert data["status"] == "completed"
+        assert data["results"]
+        assert all(r["error"] == "Sarvam AI API key not configured" for r in data["results"])
+        _active_jobs.pop(data["job_id"], None)
+
+    def test_generate_rejects_path_traversal(self, client):
+        """Should refuse paths that escape the translate directory."""
+        response = client.post("/api/tts/generate", json={"file_path": "../main.py"})
+        assert response.status_code == 403
+
+    def test_generate_rejects_malformed_path(self, client):
+        """Should refuse paths without a language folder."""
+        for file_path in ("test-simple.md", "hi/nested/test-simple.md", "../../backend/main.py"):
+            response = client.post("/api/tts/generate", json={"file_path": file_path})
+            assert response.status_code == 400
+
+    def test_status_and_summary_after_generation(self, client, offline_tts):
+        """Status and summary of a completed job should be available."""
+        response = client.post("/api/tts/generate", json={"file_path": "hi/test-simple.md"})
         assert response.status_code == 200
+        job_id = response.json()["job_id"]
+
+        status = client.get(f"/api/tts/status/{job_id}")
+        assert status.status_code == 200
+        assert status.json()["status"] == "completed"
+
+        summary = client.get(f"/api/tts/summary/{job_id}")
+        assert summary.status_code == 200
+        assert summary.json()["total_api_calls"] == response.json()["total_chunks"]
+
+        tts_service = get_tts_service()
+        assert tts_service.get_generation_summary(job_id) is tts_service.get_generation_summary(job_id)
+
+    def test_status_includes_audio_only_on_request(self, client):
+        """Chunk audio should be base64-encoded only when include_audio is set."""
+        tts_service = get_tts_service()
+        audio = make_wav(50)
+        tts_service._job_status["audio-job"] = GenerateTTSResponse(
+            job_id="audio-job", filename="audio.md", total_chunks=1, completed_chunks=1,
+            status="completed", results=[TTSChunkResult(chunk_id=0, success=True, audio_bytes=audio)]
+        )
+        try:
+            plain = client.get("/api/tts/status/audio-job").json()
+            assert plain["results"][0]["audio_base64"] is None
+            assert "audio_bytes" not in plain["results"][0]
+
+            with_audio = client.get("/api/tts/status/audio-job", params={"include_audio": True}).json()
+            assert base64.b64decode(with_audio["results"][0]["audio_base64"]) == audio
+        finally:
+            tts_service.cleanup_job("audio-job")
+
+
+class TestTTSStream:
+    """Test SSE streaming of TTS generation progress."""
+
+    def _stream_events(self, client, file_path: str) -> list:
+        """Collect (event, data) pairs from the SSE endpoint."""
+        events = []
+        with client.stream("POST", "/api/tts/generate/stream", json={"file_path": file_path}) as response:
+            assert response.status_code == 200
+            assert response.headers["x-accel-buffering"] == "no"
+            assert response.headers["cache-control"] == "no-cache"
+            assert "content-encoding" not in response.headers
+            event = None
+            for line in response.iter_lines():
+                if line.startswith("event:"):
+                    event = line.split(":", 1)[1].strip()
+                elif line.startswith("data:") and event:
+                    events.append((event, json.loads(line.split(":", 1)[1])))
+                    event = None
+        return events
+
+    def test_stream_emits_start_progress_complete(self, client, offline_tts):
+        """Should stream a start event, progress events and a final complete event."""
+        events = self._stream_events(client, "hi/test-simple.md")
+        names = [name for name, _ in events]
+        assert names[0] == "start"
+        assert "progress" in names
+        assert names[-1] == "complete"
+
+        # Coalesced progress omits job_id and ends at 100%
+        progress = [data for name, data in events if name == "progress"]
+        assert all("job_id" not in data for data in progress)
+        assert progress[-1]["percentage"] == 100
+        _active_jobs.pop(events[-1][1]["job_id"], None)
+
+    def test_stream_reports_generation_timeouts(self, client, offline_tts, monkeypatch):
+        """A timeout inside generation should be reported as is, not as a slow client."""
+        async def timing_out(*args):
+            raise TimeoutError("Sarvam AI timed out")
+            yield
+
+        monkeypatch.setattr(offline_tts, "generate_tts_for_document", timing_out)
+        events = self._stream_events(client, "hi/test-simple.md")
+        assert events[-1] == ("error", {"error": "Sarvam AI timed out"})
+
+    def test_stream_missing_file_returns_404(self, client):
+        """A missing document should fail before the stream starts."""
+        response = client.post("/api/tts/generate/stream", json={"file_path": "hi/does-not-exist.md"})
+        assert response.status_code == 404
+
+
+class TestAudioExport:
+    """Test audio export and download using synthetic audio."""
+
+    def test_export_wav(self, client, fake_job, tmp_path):
+        """Should export concatenated WAV audio."""
+        response = client.post("/api/tts/export", json={
+            "job_id": fake_job,
+            "filename": "out.wav",
+            "format": "wav"
+        })
         data = response.json()
-        
-        assert "languages" in data
-        assert isinstance(data["languages"], list)
-        assert len(data["languages"]) > 0
+        assert data["success"] is True
+        assert Path(data["output_path"]) == tmp_path / "out.wav"
+        assert data["file_size_bytes"] > 0
+        assert data["duration_seconds"] > 0
 
+    def test_export_mixed_sample_rates(self, client, fake_job, tmp_path):
+        """Chunks at another sample rate should be converted to the first chunk's."""
+        tts_service = get_tts_service()
+        last_chunk_id = max(tts_service._audio_cache[fake_job])
+        tts_service._audio_cache[fake_job][last_chunk_id] = make_wav(200, 11025)
+        response = client.post("/api/tts/export", json={"job_id": fake_job, "filename": "mixed.wav", "format": "wav"})
+        assert response.json()["success"] is True
+        with wave.open(str(tmp_path / "mixed.wav")) as wav:
+            assert wav.getframerate() == 22050
 
-class TestMarkdownParser:
-    """Test markdown parser service."""
-    
-    def test_parser_creation(self):
-        """Should create parser instance."""
-        parser = create_parser()
-        assert parser is not None
-        assert parser.max_chunk_size == 2000
-    
-    def test_parser_custom_chunk_size(self):
-        """Should respect custom chunk size."""
-        parser = create_parser(max_chunk_size=1000)
-        assert parser.max_chunk_size == 1000
-    
-    def test_clean_markdown_bold(self):
-        """Should remove bold markers."""
-        parser = MarkdownParser()
-        result = parser._clean_for_tts("This is **bold** text")
-        assert "**" not in result
-        assert "bold" in result
-    
-    def test_clean_markdown_italic(self):
-        """Should remove italic markers."""
-        parser = MarkdownParser()
-        result = parser._clean_for_tts("This is *italic* text")
-        assert result == "This is italic text"
-    
-    def test_clean_markdown_links(self):
-        """Should extract link text."""
-        parser = MarkdownParser()
-        result = parser._clean_for_tts("Check [this link](https://example.com)")
-        assert "[" not in result
-        assert "]" not in result
-        assert "this link" in result
-    
-    def test_sentence_splitting(self):
-        """Should split text into sentences."""
-        parser = MarkdownParser()
-        text = "First sentence. Second sentence! Third sentence?"
-        sentences = parser._split_into_sentences(text)
-        assert len(sentences) == 3
-    
-    def test_sentence_splitting_hindi(self):
-        """Should handle Hindi purna viram."""
-        parser = MarkdownParser()
-        text = "पहला वाक्य। दूसरा वाक्य। तीसरा वाक्य।"
-        sentences = parser._split_into_sentences(text)
-        assert len(sentences) == 3
+    def test_export_skips_failed_chunks(self, client, fake_job, tmp_path):
+        """Chunks without audio should be left out, and a job with none cannot be exported."""
+        segments = get_tts_service()._audio_cache[fake_job]
+        first_chunk_id = next(iter(segments))
+        segments[first_chunk_id] = None
+        response = client.post("/api/tts/export", json={"job_id": fake_job, "filename": "partial.wav", "format": "wav"})
+        assert response.json()["success"] is True
 
+        segments.update(dict.fromkeys(segments))
+        response = client.post("/api/tts/export", json={"job_id": fake_job, "filename": "none.wav", "format": "wav"})
+        data = response.json()
+        assert data["success"] is False
+        assert data["error"] == "No audio segments to export"
 
-class TestFileDiscoveryService:
-    """Test file discovery service."""
-    
-    def test_service_creation(self):
-        """Should create service instance."""
-        service = FileDiscoveryService()
-        assert service is not None
-    
-    def test_discover_all_languages(self):
-        """Should discover available languages."""
-        service = FileDiscoveryService()
-        languages = service.discover_all_languages()
-        assert isinstance(languages, list)
-    
-    def test_extract_title(self):
-        """Should extract title from markdown file."""
-        service = FileDiscoveryService()
-        # Create a temporary test file would be needed for full test
-        # This is a placeholder for the test structure
+    def test_wav_pcm_reads_samples_in_place(self):
+        """PCM WAV samples should be located without decoding; other audio is left to pydub."""
+        audio = make_wav(100)
+        samples, audio_format = _wav_pcm(audio)
+        with wave.open(io.BytesIO(audio)) as wav:
+            assert bytes(samples) == wav.readframes(wav.getnframes())
+        assert audio_format == (22050, 2, 1)
+        assert _wav_pcm(b"ID3" + bytes(64)) is None
 
+    def test_audio_duration_from_wav_header(self):
+        """Chunk durations should come from the WAV header at any sample rate."""
+        assert _audio_duration_ms(make_wav(200, 22050)) == 200
+        assert _audio_duration_ms(make_wav(500, 11025)) == 500
+        assert _audio_duration_ms(b"ID3" + bytes(960)) == 10  # Rough fallback
 
-class TestTTSGeneration:
-    """Test TTS generation endpoints (requires API key)."""
-    
-    def test_generate_without_api_key(self):
-        """Should handle missing API key gracefully."""
-        # First get available files
-        all_files = client.get("/api/files").json()
-        
-        if all_files and all_files[0]["files"]:
-            file = all_files[0]["files"][0]
-            response = client.post("/api/tts/generate", json={
-                "file_path": f"{file['language']}/{file['filename']}",
-                "settings": {
-                    "target_language_code": "hi-IN",
-                    "speaker": "shubh",
-                    "pace": 1.1,
-                    "speech_sample_rate": 48000,
-                    "model": "bulbul:v3",
-                    "temperature": 0.6,
-                    "enable_preprocessing": True,
-                    "heading_loudness_boost": 1.2,
-                    "pause_after_heading_ms": 500,
-                    "pause_after_bullet_ms": 300
-                }
-            })
-            
-            # Should either succeed or fail gracefully
-            assert response.status_code in [200, 500]
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as the encoder")
+    async def test_cancelled_mp3_export_stops_encoder(self, tmp_path, monkeypatch):
+        """Cancelling an export mid-write should kill the encoder process."""
+        pid_file = tmp_path / "encoder.pid"
+        encoder = tmp_path / "encoder.sh"
+        # Never reads its stdin, so writing the parts blocks once the pipe is full
+        encoder.write_text(f"#!/bin/sh\necho $$ > {pid_file}\nexec sleep 30\n")
+        encoder.chmod(0o755)
+        monkeypatch.setattr("pydub.utils.get_encoder_name", lambda: str(encoder))
+
+        export = asyncio.create_task(_encode_mp3([bytes(1 << 20)] * 4, (22050, 2, 1), tmp_path / "out.mp3"))
+        while not pid_file.exists() or not pid_file.read_text().strip():
+            await asyncio.sleep(0.01)
+        export.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await export
+
+        with pytest.raises(ProcessLookupError):
+            os.kill(int(pid_file.read_text()), 0)
+
+    def test_download_reuses_export(self, client, fake_job):
+        """Download after export should serve the already exported file."""
+        client.post("/api/tts/export", json={
+            "job_id": fake_job,
+            "filename": "out.wav",
+            "format": "wav"
+        })
+        response = client.get(f"/api/tts/download/{fake_job}", params={"format": "wav"})
+        assert response.status_code == 200
+        assert "out.wav" in response.headers["content-disposition"]
+
+    def test_download_reexports_overwritten_file(self, client, fake_job, tmp_path):
+        """An export overwritten by another job should be re-encoded, not served."""
+        client.post("/api/tts/export", json={"job_id": fake_job, "filename": "shared.wav", "format": "wav"})
+        (tmp_path / "shared.wav").write_bytes(b"another job's audio")
+
+        response = client.get(f"/api/tts/download/{fake_job}", params={"format": "wav"})
+        assert response.status_code == 200
+        assert response.content[:4] == b"RIFF"
+
+    def test_preview_chunk(self, client, fake_job):
+        """Should return the uncompressed chunk WAV with a content length."""
+        response = client.get(f"/api/tts/preview/{fake_job}/0", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/wav"
+        assert "content-encoding" not in response.headers
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert response.content[:4] == b"RIFF"
+
+    def test_preview_chunk_ranges(self, client, fake_job):
+        """In-memory chunks should answer Range requests so players can seek."""
+        audio = get_tts_service().get_audio_preview(fake_job, 0)
+        url = f"/api/tts/preview/{fake_job}/0"
+
+        response = client.get(url, headers={"Range": "bytes=10-19", "Accept-Encoding": "gzip"})
+        assert response.status_code == 206
+        assert "content-encoding" not in response.headers
+        assert response.content == audio[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(audio)}"
+        assert response.headers["accept-ranges"] == "bytes"
+
+        assert client.get(url, headers={"Range": "bytes=-4"}).content == audio[-4:]
+        assert client.get(url, headers={"Range": f"bytes={len(audio)}-"}).status_code == 416
+
+    def test_preview_chunk_from_audio_cache_file(self, client, fake_job, tmp_path, monkeypatch):
+        """Persisted chunks should be served from disk with Range support."""
+        tts_service = get_tts_service()
+        cache = AudioCache(max_bytes=0, directory=tmp_path / "cache")
+        monkeypatch.setattr(tts_service, "_chunk_cache", cache)
+        audio = make_wav()
+        asyncio.run(cache.put("preview-key", audio))
+        tts_service._chunk_keys[fake_job] = {0: "preview-key"}
+
+        response = client.get(f"/api/tts/preview/{fake_job}/0", headers={"Range": "bytes=0-99"})
+        assert response.status_code == 206
+        assert response.content == audio[:100]
+        assert response.headers["content-disposition"] == "inline; filename=chunk_0.wav"
+
+    def test_preview_missing_chunk(self, client, fake_job):
+        """Should return 404 for unknown chunk."""
+        response = client.get(f"/api/tts/preview/{fake_job}/999")
+        assert response.status_code == 404
+
+    def test_export_unknown_job(self, client):
+        """Should return 404 for unknown job."""
+        response = client.post("/api/tts/export", json={
+            "job_id": "missing",
+            "filename": "out.wav",
+            "format": "wav"
+        })
+        assert response.status_code == 404
+
+
+class TestRateLimiter:
+    """Test the token bucket used for Sarvam AI calls."""
+
+    async def test_bucket_allows_burst_up_to_capacity(self):
+        """Should not wait while tokens are available."""
+        bucket = TokenBucket(rate_per_minute=600, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        assert time.monotonic() - start < 0.05
+
+    async def test_bucket_waits_when_empty(self):
+        """Should wait for refill once the burst is spent."""
+        bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 tokens/s
+        await bucket.acquire()
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.08
+
+    async def test_hold_delays_next_caller(self):
+        """A hold should make the next caller wait even with tokens left."""
+        bucket = TokenBucket(rate_per_minute=600, capacity=5)
+        bucket.hold(0.1)
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.1
+
+    def test_default_burst_is_one_second_of_tokens(self):
+        """A fresh bucket should not allow a minute's quota in one burst."""
+        assert TokenBucket(rate_per_minute=300).capacity == 5
+        assert TokenBucket(rate_per_minute=30).capacity == 1
+
+    async def test_cancelled_wait_returns_tokens(self):
+        """A caller cancelled while waiting should not keep its reservation."""
+        bucket = TokenBucket(rate_per_minute=60, capacity=1)  # 1 token/s
+        await bucket.acquire()
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert bucket._tokens > -0.5
+
+    async def test_disabled_bucket_never_waits(self):
+        """A zero rate should disable limiting."""
+        bucket = TokenBucket(rate_per_minute=0)
+        start = time.monotonic()
+        for _ in range(100):
+            await bucket.acquire()
+        assert time.monotonic() - start < 0.05
+
+
+class TestRequestRateLimit:
+    """Test per-client admission for TTS generation endpoints."""
+
+    def test_rejects_after_max_requests(self):
+        """Should refuse requests beyond the per-window maximum."""
+        client_ip = "203.0.113.1"
+        allowed = [main.check_rate_limit(client_ip) for _ in range(main._rate_limit_max)]
+        assert all(allowed)
+        assert main.check_rate_limit(client_ip) is False
+
+    def test_clients_are_tracked_independently(self):
+        """One client's usage should not affect another."""
+        for _ in range(main._rate_limit_max):
+            main.check_rate_limit("203.0.113.2")
+        assert main.check_rate_limit("203.0.113.3") is True
+
+    def test_idle_clients_are_swept(self):
+        """Clients whose buckets have refilled should be forgotten."""
+        main.check_rate_limit("203.0.113.4")
+        main._sweep_rate_limits(time.monotonic() + main._rate_limit_window)
+        assert "203.0.113.4" not in main._rate_limit_buckets
+
+    def test_limit_applies_before_path_validation(self, client, monkeypatch):
+        """Over-limit clients should get 429 before their path is inspected."""
+        monkeypatch.setattr(main, "_rate_limit_buckets", {"testclient": (0.0, time.monotonic())})
+        response = client.post("/api/tts/generate", json={"file_path": "../../backend/main.py"})
+        assert response.status_code == 429
+        assert "retry-after" in response.headers
+
+    def test_retry_after_reflects_refill_rate(self):
+        """Retry-After should be roughly one token's refill time."""
+        client_ip = "203.0.113.5"
+        for _ in range(main._rate_limit_max):
+            main.check_rate_limit(client_ip)
+        retry_after = main.rate_limit_retry_after(client_ip)
+        assert 1 <= retry_after <= math.ceil(1 / main._rate_limit_rate)
+
+
+class TestConcurrentGeneration:
+    """Test concurrent chunk processing in the TTS service."""
+
+    async def test_chunks_run_concurrently_within_limit(self, monkeypatch):
+        """Should overlap API calls without exceeding tts_concurrency."""
+        tts_service = get_tts_service()
+        limit = tts_service.settings.tts_concurrency
+        in_flight = 0
+        peak = 0
+        audio = make_wav(50)
+
+        async def fake_process(client, headers, chunk, settings):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return (
+                TTSChunkResult(chunk_id=chunk.id, success=True, audio_bytes=audio),
+                APICallStats(chunk_id=chunk.id, characters_sent=len(chunk.text), bytes_sent=0,
+                             bytes_received=0, duration_ms=10, success=True)
+            )
+
+        monkeypatch.setattr(tts_service, "_process_chunk_with_stats", fake_process)
+        monkeypatch.setattr(tts_service, "_chunk_cache", AudioCache(max_bytes=0))
+        monkeypatch.setattr(tts_service, "_rate_limiter", RateLimiter())
+        content = "\n\n".join(f"Paragraph number {i}." for i in range(12))
+        document = create_parser().parse_content(content, "many.md")
+
+        final = None
+        async for final in tts_service.generate_tts_for_document(document, TTSSettings()):
+            pass
+
+        assert final.status == "completed"
+        assert final.completed_chunks == len(document.chunks)
+        assert all(r.success for r in final.results)
+        assert 1 < peak <= limit
+        assert len(tts_service._audio_cache[final.job_id]) == len(document.chunks)
+        tts_service.cleanup_job(final.job_id)
+
+
+    async def test_rate_limited_chunk_is_retried(self, monkeypatch):
+        """A 429 from Sarvam AI should be retried after the server's Retry-After."""
+        tts_service = get_tts_service()
+        monkeypatch.setattr(tts_service, "api_key", "test-key")
+        monkeypatch.setattr(tts_service, "_rate_limiter", RateLimiter())
+        audio_base64 = base64.b64encode(make_wav(50)).decode()
+        statuses = iter([429, 429, 200])
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.content)
+            status = next(statuses)
+            if status == 429:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"audios": [audio_base64]})
+
+        chunk = create_parser().parse_content("Retry me.", "retry.md").chunks[0]
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            result, stats = await tts_service._process_chunk_with_stats(
+                http_client, {"api-subscription-key": "test-key"}, chunk, TTSSettings()
+            )
+
+        assert result.success and stats.success
+        assert result.audio_bytes == base64.b64decode(audio_base64)
+        assert len(set(bodies)) == 1 and json.loads(bodies[0])["text"] == "Retry me."
+        assert stats.bytes_sent == len(bodies[0])
+
+    def test_job_state_is_bounded(self, monkeypatch):
+        """Jobs beyond the job cache size should be evicted from the service."""
+        monkeypatch.setattr(get_settings(), "job_cache_max_size", 2)
+        tts_service = TTSService()
+        for job_id in ("a", "b", "c"):
+            tts_service._audio_cache[job_id] = {0: make_wav(50)}
+            tts_service._job_status[job_id] = GenerateTTSResponse(
+                job_id=job_id, filename="x.md", total_chunks=1, completed_chunks=1, status="completed"
+            )
+
+        assert tts_service.get_job_status("a") is None
+        assert tts_service.get_audio_preview("a", 0) is None
+        assert tts_service.get_audio_preview("c", 0) is not None
+
+    def test_summary_totals(self):
+        """The summary should total the recorded calls and split successes from failures."""
+        tts_service = TTSService()
+        tts_service._job_status["totals"] = GenerateTTSResponse(
+            job_id="totals", filename="x.md", total_chunks=3, completed_chunks=3, status="completed",
+            results=[TTSChunkResult(chunk_id=i, success=i != 1) for i in range(3)]
+        )
+        tts_service._api_stats["totals"] = [
+            APICallStats(chunk_id=i, characters_sent=10 * i, bytes_sent=100, bytes_received=1000 * i,
+                         duration_ms=20 + i, success=i != 1)
+            for i in range(3)
+        ]
+
+        summary = tts_service.get_generation_summary("totals")
+        assert (summary.successful_calls, summary.failed_calls) == (2, 1)
+        assert summary.total_characters == 30
+        assert summary.total_bytes_sent == 300
+        assert summary.total_bytes_received == 3000
+        assert summary.total_duration_ms == 63
+        assert summary.average_response_time_ms == 21
+        assert summary.cached_chunks == 0
+
+    async def test_http_client_shared_until_closed(self):
+        """Jobs should share one HTTP client until the service is closed."""
+        tts_service = TTSService()
+        http_client = tts_service._http_client()
+        assert tts_service._http_client() is http_client
+
+        await tts_service.aclose()
+        assert http_client.is_closed
+        assert tts_service._http_client() is not http_client
+        await tts_service.aclose()
+
+    def test_retry_delay_grows_and_is_capped(self):
+        """Backoff should grow exponentially up to the cap when no Retry-After is sent."""
+        tts_service = get_tts_service()
+        base = tts_service.settings.tts_retry_base_seconds
+        assert base <= tts_service._retry_delay(0, None) <= 2 * base
+        assert 4 * base <= tts_service._retry_delay(2, None) <= 5 * base
+        assert tts_service._retry_delay(20, None) <= 30 + base
+        assert tts_service._retry_delay(0, "7") == 7
+
+
+class TestAudioCache:
+    """Test the content-addressed chunk audio cache."""
+
+    async def test_cache_round_trip_via_disk(self, tmp_path):
+        """Audio written by one cache instance should be readable by another."""
+        key = AudioCache.key_for({"text": "Hello", "speaker": "shubh"})
+        await AudioCache(max_bytes=1024, directory=tmp_path).put(key, b"audio")
+        assert await AudioCache(max_bytes=1024, directory=tmp_path).get(key) == b"audio"
+        assert (tmp_path / key[:2] / key).exists()
+
+    async def test_disk_budget_prunes_least_recently_used(self, tmp_path):
+        """A write past the disk budget should delete the oldest files first."""
+        cache = AudioCache(max_bytes=0, directory=tmp_path, max_disk_bytes=3000)
+        keys = [AudioCache.key_for({"text": f"Chunk {i}"}) for i in range(4)]
+        for age, key in enumerate(keys[:3]):
+            await cache.put(key, bytes(1000))
+            os.utime(cache.file_for(key), (1000 + age, 1000 + age))
+
+        # Reading the oldest entry makes it the most recently used
+        assert await cache.get(keys[0]) == bytes(1000)
+        await cache.put(keys[3], bytes(1000))
+
+        assert cache.file_for(keys[1]) is None
+        assert all(cache.file_for(key) for key in (keys[0], keys[2], keys[3]))
+
+    def test_key_depends_on_settings(self):
+        """Different voice settings must not share cached audio."""
+        assert AudioCache.key_for({"text": "Hello", "pace": 1.0}) != AudioCache.key_for({"text": "Hello", "pace": 1.1})
+        assert AudioCache.key_for({"a": 1, "b": 2}) == AudioCache.key_for({"b": 2, "a": 1})
+
+    async def test_repeat_generation_skips_api(self, monkeypatch, tmp_path):
+        """A second run over the same text should be served entirely from cache."""
+        tts_service = get_tts_service()
+        calls = 0
+        audio = make_wav(50)
+
+        async def fake_process(client, headers, chunk, settings):
+            nonlocal calls
+            calls += 1
+            return (
+                TTSChunkResult(chunk_id=chunk.id, success=True, audio_bytes=audio),
+                APICallStats(chunk_id=chunk.id, characters_sent=len(chunk.text), bytes_sent=0,
+                             bytes_received=0, duration_ms=10, success=True)
+            )
+
+        monkeypatch.setattr(tts_service, "_process_chunk_with_stats", fake_process)
+        monkeypatch.setattr(tts_service, "_chunk_cache", AudioCache(max_bytes=1024 * 1024, directory=tmp_path))
+        monkeypatch.setattr(tts_service, "_rate_limiter", RateLimiter())
+        document = create_parser().parse_content("# Cached\n\nSame text twice.", "cached.md")
+
+        for _ in range(2):
+            async for final in tts_service.generate_tts_for_document(document, TTSSettings()):
+                pass
+            summary = tts_service.get_generation_summary(final.job_id)
+            tts_service.cleanup_job(final.job_id)
+
+        assert calls == len(document.chunks)
+        assert all(r.success for r in final.results)
+        assert summary.total_api_calls == 0
+        assert summary.cached_chunks == len(document.chunks)
+
+
+
+class TestJobStore:
+    """Test persistence of generation jobs across restarts."""
+
+    async def test_snapshot_round_trip(self, tmp_path):
+        """Jobs written to a snapshot should be restored with their exports."""
+        document = create_parser().parse_content("# Title\n\nHello world.", "saved.md")
+        response = GenerateTTSResponse(
+            job_id="saved-job", filename="saved.md", total_chunks=2, completed_chunks=2,
+            status="completed", results=[TTSChunkResult(chunk_id=0, success=True, audio_bytes=b"RIFF")]
+        )
+        export_path = tmp_path / "saved.wav"
+        snapshot_path = tmp_path / "jobs.json"
+
+        stats = APICallStats(chunk_id=0, characters_sent=5, bytes_sent=50, bytes_received=500,
+                             duration_ms=20, success=True)
+
+        store = JobStore(maxsize=10, ttl=60)
+        store["saved-job"] = {"document": document, "response": response,
+                              "chunk_keys": {0: "key-0"}, "api_stats": [stats],
+                              "exports": {"wav": (export_path, 10, 1.5, 123)}}
+        store["running-job"] = {"document": document, "response": GenerateTTSResponse(
+            job_id="running-job", filename="saved.md", total_chunks=2, completed_chunks=1, status="processing"
+        )}
+        assert await store.snapshot(snapshot_path) is True
+        assert await store.snapshot(snapshot_path) is False  # Nothing changed since
+        saved_chunks = json.loads(snapshot_path.read_bytes())["saved-job"]["document"]["chunks"]
+        assert [("raw_text" in c) for c in saved_chunks] == [True, False]
+
+        restored = JobStore(maxsize=10, ttl=60)
+        assert restored.restore(snapshot_path) == 2
+        job = restored["saved-job"]
+        assert job["document"].chunks == document.chunks
+        assert job["response"].status == "completed"
+        assert job["response"].results[0].audio_bytes is None
+        assert job["chunk_keys"] == {0: "key-0"}
+        assert job["api_stats"] == [stats]
+        assert job["exports"]["wav"] == (export_path, 10, 1.5, 123)
+        # Generation cannot resume after a restart
+        assert restored["running-job"]["response"].status == "failed"
+
+    async def test_restored_job_exports_from_audio_cache(self, tmp_path, monkeypatch):
+        """A restored job should export from the audio cache and report its summary."""
+        monkeypatch.setitem(get_settings().__dict__, "speech_output_dir", tmp_path)
+        document = create_parser().parse_content("# Title\n\nHello world.", "restored.md")
+        tts_service = TTSService()
+        tts_service._chunk_cache = AudioCache(max_bytes=0, directory=tmp_path / "cache")
+        chunk_keys = {}
+        for chunk in document.chunks:
+            chunk_keys[chunk.id] = f"key-{chunk.id}"
+            await tts_service._chunk_cache.put(chunk_keys[chunk.id], make_wav())
+        response = GenerateTTSResponse(
+            job_id="restored-job", filename="restored.md", total_chunks=2, completed_chunks=2, status="completed",
+            results=[TTSChunkResult(chunk_id=chunk.id, success=True) for chunk in document.chunks]
+        )
+        stats = [APICallStats(chunk_id=chunk.id, characters_sent=5, bytes_sent=50, bytes_received=500,
+                              duration_ms=20, success=True) for chunk in document.chunks]
+        tts_service.restore_job(response, chunk_keys, stats)
+
+        output_path, file_size, duration = await tts_service.export_audio("restored-job", document, "restored.wav", "wav")
+        assert output_path == tmp_path / "restored.wav" and file_size > 0 and duration > 0
+        assert tts_service.get_generation_summary("restored-job").total_api_calls == 2
+
+        tts_service.cleanup_job("restored-job")
+        tts_service.restore_job(response, {0: "evicted-key"}, stats)
+        with pytest.raises(ValueError, match="regenerate"):
+            await tts_service.export_audio("restored-job", document, "restored.wav", "wav")
+
+    def test_restore_missing_or_corrupt_snapshot(self, tmp_path):
+        """A missing or unreadable snapshot should restore nothing."""
+        store = JobStore(maxsize=10, ttl=60)
+        assert store.restore(tmp_path / "missing.json") == 0
+        (tmp_path / "jobs.json").write_text("{not json")
+        assert store.restore(tmp_path / "jobs.json") == 0
 
 
 # Run tests
@@ -0,0 +1,97 @@
+"""
+Unit Tests for the Markdown Parser
+
+Exercises the parser directly, without the HTTP app.
+"""
+import pytest
+from pydantic import ValidationError
+from services.markdown_parser import MarkdownParser, create_parser
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """One markdown parser shared by the parser unit tests."""
+    return MarkdownParser()
+
+
+class TestMarkdownParser:
+    """Test markdown parser service."""
+    
+    def test_parser_creation(self):
+        """Should create parser instance."""
+        parser = create_parser()
+        assert parser is not None
+        assert parser.max_chunk_size == 2000
+    
+    def test_parser_custom_chunk_size(self):
+        """Should respect custom chunk size."""
+        parser = create_parser(max_chunk_size=1000)
+        assert parser.max_chunk_size == 1000
+
+    def test_parser_shared_per_chunk_size(self):
+        """Should hand out one parser per chunk size."""
+        assert create_parser(1000) is create_parser(1000)
+        assert create_parser() is create_parser(2000)
+        assert create_parser(1000) is not create_parser()
+    
+    def test_parse_file_reuses_unchanged_documents(self, tmp_path):
+        """Parsing an unchanged file again should return the cached document."""
+        path = tmp_path / "doc.md"
+        path.write_text("# Title\n\nFirst version.", encoding="utf-8")
+        parser = create_parser()
+
+        first = parser.parse_file(path, "hi")
+        assert parser.parse_file(path, "hi") is first
+        assert parser.parse_file(path, "eng") is not first
+
+        path.write_text("# Title\n\nSecond, longer version.", encoding="utf-8")
+        assert parser.parse_file(path, "hi").chunks[-1].text == "Second, longer version."
+
+    def test_parse_content_reuses_identical_content(self):
+        """Parsing the same content again should return the cached document."""
+        parser = create_parser()
+        first = parser.parse_content("# Upload\n\nSame body.", "upload.md", "hi")
+        assert parser.parse_content("# Upload\n\nSame body.", "upload.md", "hi") is first
+        assert parser.parse_content("# Upload\n\nSame body.", "other.md", "hi") is not first
+        assert parser.parse_content("# Upload\n\nNew body.", "upload.md", "hi").chunks[-1].text == "New body."
+
+    def test_parse_file_normalizes_line_endings(self, tmp_path):
+        """CRLF and CR files should parse exactly like their LF equivalent."""
+        content = "# Title\n\n- one\n- two\n\nLast line."
+        parser = create_parser()
+        expected = parser.parse_content(content, "doc.md").chunks
+        for newline in ("\r\n", "\r"):
+            path = tmp_path / f"doc{len(newline)}.md"
+            path.write_bytes(content.replace("\n", newline).encode("utf-8"))
+            assert parser.parse_file(path, "hi").chunks == expected
+    
+    def test_chunks_are_immutable_and_hashable(self):
+        """Parsed chunks should reject mutation and be usable as cache keys."""
+        chunk = create_parser().parse_content("# Title", "frozen.md").chunks[0]
+        with pytest.raises(ValidationError):
+            chunk.text = "changed"
+        assert {chunk: True}[chunk] is True
+    
+    @pytest.mark.parametrize("text, expected", [
+        pytest.param("This is **bold** text", "This is bold text", id="bold"),
+        pytest.param("This is *italic* text", "This is italic text", id="italic"),
+        pytest.param("Check [this link](https://example.com)", "Check this link", id="link"),
+        pytest.param(
+            "[**Listen**](a.mp3) to ![the demo](b.png) and ![](c.png) now",
+            "Listen to the demo and now",
+            id="nested-link-and-images",
+        ),
+        pytest.param("This is ***bold italic*** text", "This is bold italic text", id="bold-italic"),
+        pytest.param("***x*** and `a*b`", "x and a*b", id="emphasis-and-code"),
+    ])
+    def test_clean_markdown(self, parser, text, expected):
+        """Should strip markup, keeping link text and image alt text."""
+        assert parser._clean_for_tts(text) == expected
+
+    @pytest.mark.parametrize("text", [
+        pytest.param("First sentence. Second sentence! Third sentence?", id="latin"),
+        pytest.param("पहला वाक्य। दूसरा वाक्य। तीसरा वाक्य।", id="hindi-purna-viram"),
+    ])
+    def test_sentence_splitting(self, parser, text):
+        """Should split text into sentences, including at Hindi purna viram."""
+        assert len(parser._split_into_sentences(text)) == 3
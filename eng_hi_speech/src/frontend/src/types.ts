@@ -136,6 +136,7 @@ export interface GenerationSummary {
   total_bytes_received: number;
   total_duration_ms: number;
   average_response_time_ms: number;
+  cached_chunks?: number;
   output_file_size_bytes?: number;
   output_duration_seconds?: number;
   calls: APICallStats[];